@@ -0,0 +1,81 @@
+import argparse
+import random
+import time
+from benchmarks.run import percentile
+
+
+def random_point(rng: random.Random, bbox):
+    south, west, north, east = bbox
+    return south + rng.random() * (north - south), west + rng.random() * (east - west)
+
+
+def bench(couriers: int, queries: int, moves: int, k: int, radius_km: float, cell_degrees: float, bbox,
+          verify: bool, rng: random.Random):
+    from delivery_app.geo import GridIndex, haversine_km
+
+    index = GridIndex(cell_degrees)
+    started = time.perf_counter()
+    for courier_id in range(couriers):
+        index.update(courier_id, *random_point(rng, bbox))
+    build_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for _ in range(moves):
+        courier_id = rng.randrange(couriers)
+        if rng.random() < 0.1:
+            index.remove(courier_id)
+        else:
+            index.update(courier_id, *random_point(rng, bbox))
+    update_rate = moves / (time.perf_counter() - started)
+
+    latencies = []
+    mismatches = 0
+    for _ in range(queries):
+        lat, lon = random_point(rng, bbox)
+        started = time.perf_counter()
+        found = index.nearest(lat, lon, k, radius_km)
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+        if verify:
+            expected = sorted((haversine_km(lat, lon, p[0], p[1]), courier_id)
+                              for courier_id, p in index.positions.items())
+            expected = [courier_id for distance, courier_id in expected if distance <= radius_km][:k]
+            if [courier_id for courier_id, _ in found] != expected:
+                mismatches += 1
+
+    return {
+        'couriers': len(index),
+        'build_ms': build_ms,
+        'updates_per_second': update_rate,
+        'p50_us': percentile(latencies, 50),
+        'p95_us': percentile(latencies, 95),
+        'p99_us': percentile(latencies, 99),
+        'mismatches': mismatches if verify else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the in-memory courier grid index')
+    parser.add_argument('--couriers', type=lambda value: [int(v) for v in value.split(',')],
+                        default=[10000, 25000, 50000])
+    parser.add_argument('--queries', type=int, default=5000)
+    parser.add_argument('--moves', type=int, default=100000)
+    parser.add_argument('-k', type=int, default=5)
+    parser.add_argument('--radius-km', type=float, default=15)
+    parser.add_argument('--cell-degrees', type=float, default=0.005)
+    parser.add_argument('--bbox', type=lambda value: tuple(float(v) for v in value.split(',')),
+                        default=(42.80, 74.50, 42.95, 74.75), help='south,west,north,east')
+    parser.add_argument('--verify', action='store_true', help='check every query against brute force')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f'{"couriers":>9} {"build ms":>9} {"updates/s":>10} {"p50 us":>8} {"p95 us":>8} {"p99 us":>8} {"miss":>5}')
+    for couriers in args.couriers:
+        r = bench(couriers, args.queries, args.moves, args.k, args.radius_km, args.cell_degrees, args.bbox,
+                  args.verify, rng)
+        print(f'{r["couriers"]:9} {r["build_ms"]:9.1f} {r["updates_per_second"]:10.0f} {r["p50_us"]:8.1f} '
+              f'{r["p95_us"]:8.1f} {r["p99_us"]:8.1f} {"-" if r["mismatches"] is None else r["mismatches"]:>5}')
+
+
+if __name__ == '__main__':
+    main()
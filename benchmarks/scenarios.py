@@ -0,0 +1,42 @@
+import random
+
+
+class Scenario:
+    def __init__(self, router: str, name: str, build, auth: bool = False):
+        self.router = router
+        self.name = name
+        self.build = build
+        self.auth = auth
+
+    @property
+    def key(self):
+        return f'{self.router}:{self.name}'
+
+
+def pick(rng: random.Random, volumes: dict, table: str):
+    return rng.randint(1, volumes[table])
+
+
+SCENARIOS = [
+    Scenario('auth', 'me', lambda rng, v: '/auth/me', auth=True),
+    Scenario('category', 'list', lambda rng, v: '/category/'),
+    Scenario('category', 'detail', lambda rng, v: f'/category/{pick(rng, v, "category")}'),
+    Scenario('store', 'list', lambda rng, v: '/store/?limit=50'),
+    Scenario('store', 'detail', lambda rng, v: f'/store/{pick(rng, v, "store")}'),
+    Scenario('store', 'full', lambda rng, v: f'/store/{pick(rng, v, "store")}/full'),
+    Scenario('store', 'search', lambda rng, v: f'/store/search/?store_name={rng.choice(("piz", "plov", "tea"))}'),
+    Scenario('product', 'list', lambda rng, v: '/product/?limit=50'),
+    Scenario('product', 'price_range', lambda rng, v: f'/product/?min_price={rng.randint(1, 2000)}'
+                                                      f'&max_price={rng.randint(2000, 5000)}&limit=50'),
+    Scenario('product', 'detail', lambda rng, v: f'/product/{pick(rng, v, "product")}/'),
+    Scenario('product_combo', 'list', lambda rng, v: '/product_combo/?limit=50'),
+    Scenario('product_combo', 'detail', lambda rng, v: f'/product_combo/{pick(rng, v, "product_combo")}'),
+    Scenario('contact', 'list', lambda rng, v: '/contact/?limit=50'),
+    Scenario('courier', 'list', lambda rng, v: '/courier/?limit=50'),
+    Scenario('courier', 'detail', lambda rng, v: f'/courier/{pick(rng, v, "courier")}'),
+    Scenario('order', 'list', lambda rng, v: '/order/?limit=50'),
+    Scenario('order', 'detail', lambda rng, v: f'/order/{pick(rng, v, "order")}'),
+    Scenario('review_store', 'list', lambda rng, v: '/review_store/?limit=50'),
+    Scenario('review_product', 'list', lambda rng, v: '/review_product/?limit=50'),
+    Scenario('search', 'query', lambda rng, v: f'/search/?q={rng.choice(("pizza", "lagman", "coffee", "samsa"))}'),
+]
@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+import asyncpg
+
+BENCH_USERNAME = 'bench'
+BENCH_PASSWORD = 'bench-password'
+
+VOLUMES = {
+    'user_profile': 2000,
+    'category': 20,
+    'store': 500,
+    'contact': 1000,
+    'product': 20000,
+    'product_combo': 5000,
+    'courier': 200,
+    'order': 20000,
+    'review_store': 10000,
+    'review_product': 20000,
+}
+
+WORDS = ('pizza', 'burger', 'plov', 'lagman', 'manty', 'shashlik', 'samsa', 'salad', 'coffee', 'tea',
+         'sushi', 'roll', 'soup', 'cake', 'bread', 'kebab', 'noodles', 'dumplings', 'juice', 'pie')
+
+
+def volumes_for(scale: float):
+    return {table: max(1, int(count * scale)) for table, count in VOLUMES.items()}
+
+
+def name(rng: random.Random, words: int = 2):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).title()
+
+
+def sync_url(url: str):
+    for scheme in ('postgresql+asyncpg://', 'postgresql://', 'postgres://'):
+        if url.startswith(scheme):
+            return 'postgresql://' + url[len(scheme):]
+    return url
+
+
+async def create_schema(url: str):
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from delivery_app.db.database import Base, async_url
+    import delivery_app.db.models  # noqa: F401
+
+    engine = create_async_engine(async_url(url))
+    async with engine.begin() as conn:
+        await conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+def generate(volumes: dict, rng: random.Random, password_hash: str):
+    now = datetime.utcnow()
+    v = volumes
+    statuses = ('client', 'owner', 'courier')
+    yield 'user_profile', ('id', 'first_name', 'last_name', 'username', 'hash_password', 'status', 'date_registered'), [
+        (i, name(rng, 1), name(rng, 1), BENCH_USERNAME if i == 1 else f'user{i}', password_hash,
+         statuses[i % 3], now - timedelta(days=rng.randint(0, 700)))
+        for i in range(1, v['user_profile'] + 1)
+    ]
+    yield 'category', ('id', 'category_name'), [
+        (i, f'{name(rng, 1)} {i}') for i in range(1, v['category'] + 1)
+    ]
+    yield 'store', ('id', 'store_name', 'category_id', 'description', 'store_image', 'address', 'owner_id'), [
+        (i, name(rng)[:32], rng.randint(1, v['category']), name(rng, 12), f'stores/{i}.jpg',
+         f'{rng.randint(1, 200)} {name(rng, 1)} street', rng.randint(1, v['user_profile']))
+        for i in range(1, v['store'] + 1)
+    ]
+    yield 'contact', ('id', 'title', 'contact_number', 'social_network', 'store_id'), [
+        (i, name(rng, 1)[:32], f'+996{rng.randint(500000000, 799999999)}', None, rng.randint(1, v['store']))
+        for i in range(1, v['contact'] + 1)
+    ]
+    yield 'product', ('id', 'product_name', 'description', 'product_image', 'price', 'store_id'), [
+        (i, name(rng)[:64], name(rng, 10), f'products/{i}.jpg', Decimal(rng.randint(100, 500000)) / 100,
+         rng.randint(1, v['store']))
+        for i in range(1, v['product'] + 1)
+    ]
+    yield 'product_combo', ('id', 'combo_name', 'description', 'combo_image', 'price', 'store_id', 'category_id'), [
+        (i, name(rng, 3)[:64], name(rng, 10), f'combos/{i}.jpg', Decimal(rng.randint(500, 900000)) / 100,
+         rng.randint(1, v['store']), rng.randint(1, v['category']))
+        for i in range(1, v['product_combo'] + 1)
+    ]
+    yield 'courier', ('id', 'courier_id', 'product_current_orders_id', 'combo_current_orders_id', 'status_choices'), [
+        (i, rng.randint(1, v['user_profile']), rng.randint(1, v['product']), rng.randint(1, v['product_combo']),
+         rng.choice(('available', 'employed')))
+        for i in range(1, v['courier'] + 1)
+    ]
+    order_statuses = ('awaiting_processing', 'during_the_delivery_process', 'delivered', 'cancelled')
+    yield 'order', ('id', 'status', 'delivery_address', 'created_date', 'client_id'), [
+        (i, rng.choice(order_statuses), f'{rng.randint(1, 200)} {name(rng, 1)} street',
+         now - timedelta(minutes=rng.randint(0, 60 * 24 * 90)), rng.randint(1, v['user_profile']))
+        for i in range(1, v['order'] + 1)
+    ]
+    yield 'review_store', ('id', 'user_name_id', 'store_id'), [
+        (i, rng.randint(1, v['user_profile']), rng.randint(1, v['store']))
+        for i in range(1, v['review_store'] + 1)
+    ]
+    yield 'review_product', ('id', 'user_name_id', 'product_id'), [
+        (i, rng.randint(1, v['user_profile']), rng.randint(1, v['product']))
+        for i in range(1, v['review_product'] + 1)
+    ]
+
+
+async def seed(url: str, scale: float = 1.0, rng_seed: int = 42):
+    from delivery_app.passwords import password_context
+
+    await create_schema(url)
+    volumes = volumes_for(scale)
+    rng = random.Random(rng_seed)
+    password_hash = password_context.hash(BENCH_PASSWORD)
+
+    conn = await asyncpg.connect(sync_url(url))
+    try:
+        for table, columns, rows in generate(volumes, rng, password_hash):
+            await conn.copy_records_to_table(table, records=rows, columns=columns)
+            await conn.execute(f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+                               f"(SELECT max(id) FROM \"{table}\"))")
+        await conn.execute('ANALYZE')
+    finally:
+        await conn.close()
+    return volumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recreate the schema and seed a benchmark database')
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    volumes = asyncio.run(seed(args.database_url, args.scale, args.seed))
+    for table, count in volumes.items():
+        print(f'{table:16} {count}')
+
+
+if __name__ == '__main__':
+    main()
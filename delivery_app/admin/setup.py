@@ -6,4 +6,6 @@ from delivery_app.db.database import engine
 def setup_admin(app: FastAPI):
     admin = Admin(app, engine)
     admin.add_view(UserProfileAdmin)
-    admin.add_view(CategoryAdmin)
\ No newline at end of file
+    admin.add_view(CategoryAdmin)
+    admin.add_view(StoreAdmin)
+    admin.add_view(ProductAdmin)
\ No newline at end of file
@@ -1,6 +1,19 @@
 from sqladmin import ModelView, Admin
 from delivery_app.db.models import *
 from delivery_app.db.database import engine
+from delivery_app.cache import invalidate
+from delivery_app.security import invalidate_user
+
+
+class CacheInvalidationMixin:
+    cache_entity: str = ''
+    cache_cascade: list = []
+
+    async def after_model_change(self, data, model, is_created, request):
+        await invalidate(f'{self.cache_entity}:list', f'{self.cache_entity}:{model.id}')
+
+    async def after_model_delete(self, model, request):
+        await invalidate(f'{self.cache_entity}:list', f'{self.cache_entity}:{model.id}', *self.cache_cascade)
 
 
 class UserProfileAdmin(ModelView, model=UserProfile):
@@ -8,8 +21,31 @@ class UserProfileAdmin(ModelView, model=UserProfile):
     name = 'User'
     name_plural = 'Users'
 
+    async def after_model_change(self, data, model, is_created, request):
+        invalidate_user(model.id)
+
+    async def after_model_delete(self, model, request):
+        invalidate_user(model.id)
 
-class CategoryAdmin(ModelView, model=Category):
+
+class CategoryAdmin(CacheInvalidationMixin, ModelView, model=Category):
     column_list = [Category.id, Category.category_name]
     name = 'Category'
-    name_plural = 'Categories'
\ No newline at end of file
+    name_plural = 'Categories'
+    cache_entity = 'category'
+    cache_cascade = ['category', 'store', 'product', 'product_combo']
+
+
+class StoreAdmin(CacheInvalidationMixin, ModelView, model=Store):
+    column_list = [Store.id, Store.store_name, Store.category_id, Store.owner_id]
+    name = 'Store'
+    name_plural = 'Stores'
+    cache_entity = 'store'
+    cache_cascade = ['product', 'product_combo']
+
+
+class ProductAdmin(CacheInvalidationMixin, ModelView, model=Product):
+    column_list = [Product.id, Product.product_name, Product.price, Product.store_id]
+    name = 'Product'
+    name_plural = 'Products'
+    cache_entity = 'product'
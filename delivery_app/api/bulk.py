@@ -0,0 +1,111 @@
+import json
+from fastapi import HTTPException, Query, Request
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.config import BULK_BATCH_SIZE, BULK_MAX_ROWS
+
+NDJSON_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+MAX_BATCH_SIZE = 2000
+
+
+class BulkParams:
+    def __init__(self, upsert: bool = Query(False),
+                 batch_size: int = Query(BULK_BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE)):
+        self.upsert = upsert
+        self.batch_size = batch_size
+
+
+class RowParseError:
+    def __init__(self, message: str):
+        self.message = message
+
+
+def parse_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return RowParseError(str(e))
+
+
+def check_size(rows):
+    if len(rows) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f'At most {BULK_MAX_ROWS} rows per request')
+
+
+async def read_rows(request: Request):
+    content_type = request.headers.get('content-type', '').split(';')[0].strip()
+    if content_type not in NDJSON_TYPES:
+        try:
+            rows = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail='Body must be a JSON array or NDJSON')
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail='Body must be a JSON array or NDJSON')
+        check_size(rows)
+        return rows
+
+    rows = []
+    buffer = b''
+    async for chunk in request.stream():
+        *lines, buffer = (buffer + chunk).split(b'\n')
+        rows.extend(parse_line(line) for line in lines if line.strip())
+        check_size(rows)
+    if buffer.strip():
+        rows.append(parse_line(buffer))
+    check_size(rows)
+    return rows
+
+
+def validate_rows(schema, rows):
+    valid, errors, seen = [], [], set()
+    for index, row in enumerate(rows):
+        if isinstance(row, RowParseError):
+            errors.append({'index': index, 'errors': [{'msg': row.message}]})
+            continue
+        try:
+            data = schema.model_validate(row).model_dump()
+        except ValidationError as e:
+            errors.append({'index': index, 'errors': json.loads(e.json(include_url=False))})
+            continue
+        if data['id'] in seen:
+            errors.append({'index': index, 'errors': [{'msg': f"duplicate id {data['id']} in payload"}]})
+            continue
+        seen.add(data['id'])
+        valid.append((index, data))
+    return valid, errors
+
+
+async def bulk_create(request: Request, db: AsyncSession, schema, model, references: dict, params: BulkParams):
+    valid, errors = validate_rows(schema, await read_rows(request))
+    for field, column in references.items():
+        wanted = {data[field] for _, data in valid}
+        if not wanted:
+            continue
+        result = await db.execute(select(column).where(column.in_(wanted)))
+        missing = wanted - set(result.scalars().all())
+        for index, data in valid:
+            if data[field] in missing:
+                errors.append({'index': index, 'errors': [{'loc': [field], 'msg': f'{field} {data[field]} does not exist'}]})
+        valid = [(index, data) for index, data in valid if data[field] not in missing]
+
+    ids, skipped = [], []
+    for start in range(0, len(valid), params.batch_size):
+        batch = valid[start:start + params.batch_size]
+        stmt = insert(model).values([data for _, data in batch])
+        if params.upsert:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[model.id],
+                set_={key: stmt.excluded[key] for key in batch[0][1] if key != 'id'},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[model.id])
+        result = await db.execute(stmt.returning(model.id))
+        inserted = set(result.scalars().all())
+        ids.extend(sorted(inserted))
+        skipped.extend(index for index, data in batch if data['id'] not in inserted)
+    await db.commit()
+
+    errors.sort(key=lambda error: error['index'])
+    return {'created': len(ids), 'ids': ids, 'skipped': skipped, 'errors': errors}
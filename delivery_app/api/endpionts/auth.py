@@ -1,17 +1,17 @@
 from fastapi import Depends, HTTPException, APIRouter
-from sqlalchemy.orm import Session
-from delivery_app.db.models import(UserProfile, RefreshToken)
-from delivery_app.db.schema import (UserProfileSchema)
-from delivery_app.db.database import SessionLocal
-from typing import Optional
-from delivery_app.config import SECRET_KEY, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS, ALGORITHM
-from jose import jwt
-from passlib.context import CryptContext
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from datetime import timedelta, datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.db.models import UserProfile
+from delivery_app.db.schema import (UserProfileSchema, CurrentUserSchema)
+from delivery_app.db.database import get_db
+from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_limiter.depends import RateLimiter
 from starlette.requests import Request
 from delivery_app.config import settings
+from delivery_app.passwords import get_password_hash, verify_password
+from delivery_app.security import create_access_token, get_current_user
+from delivery_app.refresh_tokens import (issue_refresh_token, revoke_refresh_token, rotate_refresh_token,
+                                         revoke_all_refresh_tokens)
 from authlib import oauth2
 from authlib.integrations.starlette_client import OAuth
 
@@ -32,41 +32,14 @@ oauth.register(
 
 auth_router = APIRouter(prefix='/auth', tags=['Auth'])
 
-oauth2_schema = OAuth2PasswordBearer(tokenUrl='/auth/login')
-password_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
-
-async def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta if expires_delta else timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({'exp':expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-
-
-def verify_password(plain_password, hash_password):
-    return password_context.verify(plain_password, hash_password)
-
-
-def create_refresh_token(data: dict):
-    return create_access_token(data, expires_delta= timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
-
-
-def get_password_hash(password):
-    return password_context.hash(password)
-
 
 @auth_router.post('/register/')
-async def register(user: UserProfileSchema, db: Session = Depends(get_db)):
-    user_db = db.query(UserProfile).filter(UserProfile.username == user.username).first()
+async def register(user: UserProfileSchema, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(UserProfile).where(UserProfile.username == user.username))
+    user_db = result.scalars().first()
     if user_db:
         raise HTTPException(status_code=400, detail='uesername бар экен')
-    new_hash_pass = get_password_hash(user.password)
+    new_hash_pass = await get_password_hash(user.password)
     new_user = UserProfile(
         first_name=user.first_name,
         last_name=user.last_name,
@@ -78,45 +51,52 @@ async def register(user: UserProfileSchema, db: Session = Depends(get_db)):
         hash_password=new_hash_pass
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return {"message": 'Saved'}
 
 
 @auth_router.post('/login', dependencies=[Depends(RateLimiter(times=2, seconds=10))])
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(UserProfile).filter(UserProfile.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hash_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(UserProfile).where(UserProfile.username == form_data.username))
+    user = result.scalars().first()
+    if not user:
         raise HTTPException(status_code=401, detail='Маалымат туура эмес')
-    access_token = create_access_token({'sub': user.username})
-    refresh_token = create_refresh_token({'sub': user.username})
-    token_db = RefreshToken(token=refresh_token, user_id=user.id)
-    db.add(token_db)
-    db.commit()
+    valid, new_hash = await verify_password(form_data.password, user.hash_password)
+    if not valid:
+        raise HTTPException(status_code=401, detail='Маалымат туура эмес')
+    if new_hash:
+        user.hash_password = new_hash
+        await db.commit()
+    access_token = create_access_token({'sub': user.username, 'user_id': user.id})
+    refresh_token = await issue_refresh_token(user.id, user.username)
 
     return {'access_token': access_token, 'refresh_token': refresh_token, 'token_type': 'bearer'}
 
 
 @auth_router.post('/logout')
-async def logout(refresh_token: str, db: Session = Depends(get_db)):
-    stored_token = db.query(RefreshToken).filter(RefreshToken.token == refresh_token).first()
-
-    if not stored_token:
-        raise HTTPException(status_code=401, detail='маалымат туура эмес')
-    db.delete(stored_token)
-    db.commit()
+async def logout(refresh_token: str):
+    await revoke_refresh_token(refresh_token)
     return {'message': "Вышли"}
 
 
+@auth_router.post('/logout_all')
+async def logout_all(current_user: CurrentUserSchema = Depends(get_current_user)):
+    revoked = await revoke_all_refresh_tokens(current_user.id)
+    return {'message': "Вышли", 'revoked': revoked}
+
+
 @auth_router.post('/refresh')
-async def refresh(refresh_token: str, db: Session = Depends(get_db)):
-    token_entry = db.query(RefreshToken).filter(RefreshToken.token == refresh_token).first()
+async def refresh(refresh_token: str):
+    user_id, username, new_refresh_token = await rotate_refresh_token(refresh_token)
+    access_token = create_access_token({"sub": username, 'user_id': user_id})
+
+    return {'access_token': access_token, 'refresh_token': new_refresh_token, "token_type": "bearer"}
 
-    if not token_entry:
-        raise HTTPException(status_code=401, detail='маалымат туура эмес')
-    access_token = create_access_token({"sub": token_entry.user_id})
 
-    return {'access_token': access_token, "token_type": "bearer"}
+@auth_router.get('/me', response_model=CurrentUserSchema)
+async def me(current_user: CurrentUserSchema = Depends(get_current_user)):
+    return current_user
 
 
 @auth_router.get('/github')
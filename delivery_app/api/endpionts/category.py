@@ -1,68 +1,71 @@
 from fastapi import Depends, HTTPException, APIRouter
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from delivery_app.db.models import Category
-from delivery_app.db.schema import CategorySchema
-from delivery_app.db.database import SessionLocal
-from typing import List
+from delivery_app.db.schema import CategorySchema, CategoryUpdateSchema, Page
+from delivery_app.db.database import get_db
+from delivery_app.db.crud import update_returning, delete_returning
+from delivery_app.api.pagination import PageParams, paginate
+from delivery_app.cache import cached, cache_key, invalidate
 
 category_router = APIRouter(prefix='/category', tags=['Category'])
 
-async def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 
 @category_router.post('/', response_model=CategorySchema)
-async def create_category(category: CategorySchema, db: Session = Depends(get_db)):
+async def create_category(category: CategorySchema, db: AsyncSession = Depends(get_db)):
     try:
         category_db = Category(category_name=category.category_name)
         db.add(category_db)
-        db.commit()
-        db.refresh(category_db)
+        await db.commit()
+        await db.refresh(category_db)
+        await invalidate('category:list')
         return category_db
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@category_router.get('/', response_model=List[CategorySchema])
-async def get_category(db: Session = Depends(get_db)):
-    return db.query(Category).all()
+@category_router.get('/', response_model=Page[CategorySchema])
+async def get_category(page: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    return await cached(cache_key('category', 'list', page.cursor, page.limit), Page[CategorySchema],
+                        lambda: paginate(db, select(Category), page, Category.id),
+                        tags=['category', 'category:list'])
 
 
 @category_router.get('/{category_id}', response_model=CategorySchema)
-async def get_category_id(category_id: int, db: Session = Depends(get_db)):
-    category = db.query(Category).filter(Category.id==category_id).first()
+async def get_category_id(category_id: int, db: AsyncSession = Depends(get_db)):
+    async def load():
+        result = await db.execute(select(Category).where(Category.id == category_id))
+        category = result.scalars().first()
+
+        if category is None:
+            raise HTTPException(status_code=404, detail='такого категории не существует')
+        return category
 
-    if category is None:
-        raise HTTPException(status_code=404, detail='такого категории не существует')
-    return category
+    return await cached(cache_key('category', category_id), CategorySchema, load,
+                        tags=['category', f'category:{category_id}'])
 
 
 @category_router.put('/{category_id}', response_model=CategorySchema)
-async def update_category(category_id: int, category: CategorySchema, db: Session = Depends(get_db)):
-    category_db = db.query(Category).filter(Category.id==category_id).first()
+async def update_category(category_id: int, category: CategorySchema, db: AsyncSession = Depends(get_db)):
+    category_db = await update_returning(db, Category, category_id, {'category_name': category.category_name},
+                                         'такого категории не существует')
+    await invalidate('category:list', f'category:{category_id}')
+    return category_db
 
-    if category_db is None:
-        raise HTTPException(status_code=404, detail='такого категории не существует')
-    category_db.category_name = category.category_name
 
-    db.add(category_db)
-    db.commit()
-    db.refresh(category_db)
+@category_router.patch('/{category_id}', response_model=CategorySchema)
+async def patch_category(category_id: int, category: CategoryUpdateSchema, db: AsyncSession = Depends(get_db)):
+    category_db = await update_returning(db, Category, category_id,
+                                         category.model_dump(exclude_unset=True, exclude_none=True),
+                                         'такого категории не существует')
+    await invalidate('category:list', f'category:{category_id}')
     return category_db
 
 
 @category_router.delete('/{category_id}')
-async def delete_category(category_id: int, db: Session = Depends(get_db)):
-    category = db.query(Category).filter(Category.id==category_id).first()
-    if category is None:
-        raise HTTPException(status_code=404, detail='такого категории не существует')
-
-    db.delete(category)
-    db.commit()
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_db)):
+    await delete_returning(db, Category, category_id, 'такого категории не существует')
+    await invalidate('category', 'store', 'product', 'product_combo')
     return {"message": 'This category deleted'}
 
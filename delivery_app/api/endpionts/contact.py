@@ -1,56 +1,38 @@
-from fastapi import Depends, HTTPException, APIRouter
-from sqlalchemy.orm import Session
+from fastapi import Depends, APIRouter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from delivery_app.db.models import Contact
-from delivery_app.db.schema import ContactSchema
-from delivery_app.db.database import SessionLocal
-from typing import List
+from delivery_app.db.schema import ContactSchema, Page
+from delivery_app.db.database import get_db
+from delivery_app.db.crud import update_returning, delete_returning
+from delivery_app.api.pagination import PageParams, paginate
 
 contact_router = APIRouter(prefix='/contact', tags=['Contact'])
 
-async def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @contact_router.post('/create')
-async def contact_create(contact: ContactSchema, db: Session = Depends(get_db)):
+async def contact_create(contact: ContactSchema, db: AsyncSession = Depends(get_db)):
     contact_db = Contact(**contact.dict())
     db.add(contact_db)
-    db.commit()
-    db.refresh(contact_db)
+    await db.commit()
+    await db.refresh(contact_db)
     return contact_db
 
 
-@contact_router.get('/', response_model=List[ContactSchema])
-async def contact_list(db: Session = Depends(get_db)):
-    return db.query(Contact).all()
+@contact_router.get('/', response_model=Page[ContactSchema])
+async def contact_list(page: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    return await paginate(db, select(Contact), page, Contact.id)
 
 
 
 @contact_router.put('/edit', response_model=ContactSchema)
-async def update_contact(contact_id: int, contact: ContactSchema, db: Session = Depends(get_db)):
-    contact_db = db.query(Contact).filter(Contact.id==contact_id).first()
-
-    if contact_db is None:
-        raise HTTPException(status_code=404, detail='такого контакта не существует')
-    for contact_key, contact_value in contact.dict().items():
-        setattr(contact_db, contact_key, contact_value)
-
-    db.add(contact_db)
-    db.commit()
-    db.refresh(contact_db)
+async def update_contact(contact_id: int, contact: ContactSchema, db: AsyncSession = Depends(get_db)):
+    contact_db = await update_returning(db, Contact, contact_id, contact.model_dump(exclude={'id'}),
+                                         'такого контакта не существует')
     return contact_db
 
 
 @contact_router.delete('/delete')
-async def delete_contact(contact_id: int, db: Session = Depends(get_db)):
-    contact = db.query(Contact).filter(Contact.id==contact_id).first()
-    if contact is None:
-        raise HTTPException(status_code=404, detail='такого контакта не существует')
-
-    db.delete(contact)
-    db.commit()
+async def delete_contact(contact_id: int, db: AsyncSession = Depends(get_db)):
+    await delete_returning(db, Contact, contact_id, 'такого контакта не существует')
     return {"message": 'This contact deleted'}
 
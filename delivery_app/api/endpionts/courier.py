@@ -1,36 +1,39 @@
-from fastapi import Depends, HTTPException, APIRouter
-from sqlalchemy.orm import Session
-from delivery_app.db.models import Courier
-from delivery_app.db.schema import CourierSchema
-from delivery_app.db.database import SessionLocal
+import json
+from fastapi import Depends, HTTPException, APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.db.models import Courier, StatusCourierChoices
+from delivery_app.db.schema import (CourierSchema, CourierUpdateSchema, CourierLocationSchema, LocationPingSchema,
+                                   Page)
+from delivery_app.db.database import get_db
+from delivery_app.db.crud import update_returning, delete_returning
+from delivery_app.api.pagination import PageParams, paginate
+from delivery_app.geo import publish_courier
+from delivery_app.locations import ingest
+from delivery_app.config import LOCATION_BATCH_MAX
 from typing import List
 
 courier_router = APIRouter(prefix='/courier', tags=['Courier'])
 
-async def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @courier_router.post('/create')
-async def courier_create(courier: CourierSchema, db: Session = Depends(get_db)):
+async def courier_create(courier: CourierSchema, db: AsyncSession = Depends(get_db)):
     courier_db = Courier(**courier.dict())
     db.add(courier_db)
-    db.commit()
-    db.refresh(courier_db)
+    await db.commit()
+    await db.refresh(courier_db)
     return courier_db
 
 
-@courier_router.get('/', response_model=List[CourierSchema])
-async def courier_list(db: Session = Depends(get_db)):
-    return db.query(Courier).all()
+@courier_router.get('/', response_model=Page[CourierSchema])
+async def courier_list(page: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    return await paginate(db, select(Courier), page, Courier.id)
 
 
-@courier_router.get('/{courier_id}', response_model=List[CourierSchema])
-async def courier_detail(courier_id: int, db: Session = Depends(get_db)):
-    courier = db.query(Courier).filter(Courier.id==courier_id).first()
+@courier_router.get('/{courier_id}', response_model=CourierSchema)
+async def courier_detail(courier_id: int, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Courier).where(Courier.id == courier_id))
+    courier = result.scalars().first()
 
     if courier is None:
         raise HTTPException(status_code=400, detail='Мындай маалымат жок')
@@ -38,28 +41,72 @@ async def courier_detail(courier_id: int, db: Session = Depends(get_db)):
 
 
 @courier_router.put('/{courier_id}', response_model=CourierSchema)
-async def update_courier(courier_id: int, courier: CourierSchema, db: Session = Depends(get_db)):
-    courier_db = db.query(Courier).filter(Courier.id==courier_id).first()
+async def update_courier(courier_id: int, courier: CourierSchema, db: AsyncSession = Depends(get_db)):
+    courier_db = await update_returning(db, Courier, courier_id, courier.model_dump(exclude={'id', 'status_choices'}),
+                                         'такого продукта не существует')
+    return courier_db
 
-    if courier_db is None:
-        raise HTTPException(status_code=404, detail='такого продукта не существует')
-    for courier_key, courier_value in courier.dict().items():
-        setattr(courier_db, courier_key, courier_value)
 
-    db.add(courier_db)
-    db.commit()
-    db.refresh(courier_db)
+@courier_router.patch('/{courier_id}', response_model=CourierSchema)
+async def patch_courier(courier_id: int, courier: CourierUpdateSchema, db: AsyncSession = Depends(get_db)):
+    courier_db = await update_returning(db, Courier, courier_id,
+                                         courier.model_dump(exclude_unset=True, exclude_none=True),
+                                         'такого продукта не существует')
     return courier_db
 
 
-@courier_router.delete('/{courier_id}')
-async def delete_courier(courier_id: int, db: Session = Depends(get_db)):
-    courier = db.query(Courier).filter(Courier.id==courier_id).first()
-    if courier is None:
+@courier_router.put('/{courier_id}/location')
+async def update_courier_location(courier_id: int, location: CourierLocationSchema,
+                                  db: AsyncSession = Depends(get_db)):
+    result = await db.execute(
+        update(Courier)
+        .where(Courier.id == courier_id)
+        .values(latitude=location.latitude, longitude=location.longitude,
+                location_updated_at=func.timezone('utc', func.now()))
+        .returning(Courier.status_choices)
+    )
+    courier_status = result.scalar_one_or_none()
+    if courier_status is None:
         raise HTTPException(status_code=404, detail='такого курьера не существует')
+    await db.commit()
+    await publish_courier(courier_id, location.latitude, location.longitude,
+                          courier_status == StatusCourierChoices.available)
+    return {'message': 'Location saved'}
+
 
-    db.delete(courier)
-    db.commit()
+@courier_router.post('/locations')
+async def ingest_locations(pings: List[LocationPingSchema]):
+    if len(pings) > LOCATION_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f'At most {LOCATION_BATCH_MAX} pings per request')
+    if not await ingest(pings):
+        raise HTTPException(status_code=503, detail='Location buffer is full', headers={'Retry-After': '1'})
+    return {'accepted': len(pings)}
+
+
+@courier_router.websocket('/{courier_id}/locations/ws')
+async def location_stream(websocket: WebSocket, courier_id: int):
+    await websocket.accept()
+    try:
+        while True:
+            try:
+                data = json.loads(await websocket.receive_text())
+                items = data if isinstance(data, list) else [data]
+                if len(items) > LOCATION_BATCH_MAX:
+                    await websocket.send_json({'error': 'batch too large', 'max': LOCATION_BATCH_MAX})
+                    continue
+                pings = [LocationPingSchema(**{**item, 'courier_id': courier_id}) for item in items]
+            except (ValueError, TypeError, ValidationError):
+                await websocket.send_json({'error': 'invalid ping'})
+                continue
+            if not await ingest(pings):
+                await websocket.send_json({'error': 'overloaded', 'retry_after': 1})
+    except WebSocketDisconnect:
+        pass
+
+
+@courier_router.delete('/{courier_id}')
+async def delete_courier(courier_id: int, db: AsyncSession = Depends(get_db)):
+    await delete_returning(db, Courier, courier_id, 'такого курьера не существует')
     return {"message": 'This courier deleted'}
 
 
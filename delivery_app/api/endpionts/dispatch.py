@@ -0,0 +1,45 @@
+from fastapi import Depends, APIRouter, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.db.models import Store
+from delivery_app.db.schema import OrderSchema, OrderTransitionSchema, NearestCourierSchema
+from delivery_app.db.database import get_db
+from delivery_app.dispatch import claim_next_order, transition_order
+from delivery_app.geo import courier_index
+from delivery_app.config import GEO_MAX_RADIUS_KM
+from typing import List
+
+dispatch_router = APIRouter(prefix='/dispatch', tags=['Dispatch'])
+
+
+@dispatch_router.post('/courier/{courier_id}/claim', response_model=OrderSchema,
+                      responses={204: {'description': 'No orders are waiting'}})
+async def claim_order(courier_id: int, db: AsyncSession = Depends(get_db)):
+    order = await claim_next_order(db, courier_id)
+    if order is None:
+        return Response(status_code=204)
+    return order
+
+
+@dispatch_router.post('/order/{order_id}/transition', response_model=OrderSchema)
+async def order_transition(order_id: int, transition: OrderTransitionSchema, db: AsyncSession = Depends(get_db)):
+    return await transition_order(db, order_id, transition.status, transition.version)
+
+
+@dispatch_router.get('/store/{store_id}/nearest', response_model=List[NearestCourierSchema])
+async def nearest_couriers(store_id: int, k: int = Query(5, ge=1, le=50),
+                           radius_km: float = Query(GEO_MAX_RADIUS_KM, gt=0, le=GEO_MAX_RADIUS_KM),
+                           db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Store.latitude, Store.longitude).where(Store.id == store_id))
+    store = result.first()
+    if store is None:
+        raise HTTPException(status_code=404, detail='Store Not Found')
+    if store.latitude is None or store.longitude is None:
+        raise HTTPException(status_code=409, detail='Store has no coordinates')
+
+    nearest = courier_index.nearest(store.latitude, store.longitude, k, radius_km)
+    return [
+        {'courier_id': courier_id, 'distance_km': distance,
+         'latitude': courier_index.positions[courier_id][0], 'longitude': courier_index.positions[courier_id][1]}
+        for courier_id, distance in nearest
+    ]
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from delivery_app.config import EXPORT_BATCH_SIZE
+from delivery_app.db.database import SessionLocal
+from delivery_app.db.models import Product, ProductCombo, Store, Order, StatusOrderChoices
+from typing import Optional
+
+export_router = APIRouter(prefix='/export', tags=['Export'])
+
+FORMAT_PATTERN = '^(csv|ndjson)$'
+MEDIA_TYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+
+def plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def utc_naive(value: datetime):
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def csv_lines(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def encode(rows, columns, fmt: str):
+    if fmt == 'ndjson':
+        return ''.join(json.dumps({c: plain(row[c]) for c in columns}) + '\n' for row in rows)
+    return csv_lines([plain(row[c]) for c in columns] for row in rows)
+
+
+async def stream_rows(query, columns, fmt: str):
+    if fmt == 'csv':
+        yield csv_lines([columns])
+    async with SessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.mappings().partitions():
+            yield encode(rows, columns, fmt)
+
+
+def export_response(query, fmt: str, name: str):
+    columns = [c.name for c in query.selected_columns]
+    return StreamingResponse(
+        stream_rows(query, columns, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@export_router.get('/product')
+async def export_product(format: str = Query('ndjson', pattern=FORMAT_PATTERN),
+                         store_id: Optional[int] = None, category_id: Optional[int] = None):
+    query = select(*Product.__table__.c).order_by(Product.id)
+    if store_id is not None:
+        query = query.where(Product.store_id == store_id)
+    if category_id is not None:
+        query = query.join(Store, Store.id == Product.store_id).where(Store.category_id == category_id)
+    return export_response(query, format, 'product')
+
+
+@export_router.get('/product_combo')
+async def export_product_combo(format: str = Query('ndjson', pattern=FORMAT_PATTERN),
+                               store_id: Optional[int] = None, category_id: Optional[int] = None):
+    query = select(*ProductCombo.__table__.c).order_by(ProductCombo.id)
+    if store_id is not None:
+        query = query.where(ProductCombo.store_id == store_id)
+    if category_id is not None:
+        query = query.where(ProductCombo.category_id == category_id)
+    return export_response(query, format, 'product_combo')
+
+
+@export_router.get('/order')
+async def export_order(format: str = Query('ndjson', pattern=FORMAT_PATTERN),
+                       status: Optional[StatusOrderChoices] = None, client_id: Optional[int] = None,
+                       date_from: Optional[datetime] = None, date_to: Optional[datetime] = None):
+    query = select(*Order.__table__.c).order_by(Order.id)
+    if status is not None:
+        query = query.where(Order.status == status)
+    if client_id is not None:
+        query = query.where(Order.client_id == client_id)
+    if date_from is not None:
+        query = query.where(Order.created_date >= utc_naive(date_from))
+    if date_to is not None:
+        query = query.where(Order.created_date < utc_naive(date_to))
+    return export_response(query, format, 'order')
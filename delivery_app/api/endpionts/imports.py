@@ -0,0 +1,53 @@
+import os
+import tempfile
+from fastapi import HTTPException, APIRouter, Request, Query
+from starlette.concurrency import run_in_threadpool
+from delivery_app.config import IMPORT_MAX_BYTES
+from delivery_app.importer import IMPORT_TARGETS, start_import, get_job
+from typing import Optional
+
+import_router = APIRouter(prefix='/import', tags=['Import'])
+
+NDJSON_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+too_large_exception = HTTPException(status_code=413, detail=f'Import file is limited to {IMPORT_MAX_BYTES} bytes')
+
+
+@import_router.post('/{entity}', status_code=202)
+async def import_catalogue(entity: str, request: Request, format: Optional[str] = Query(None, pattern='^(csv|ndjson)$')):
+    if entity not in IMPORT_TARGETS:
+        raise HTTPException(status_code=404, detail='Unknown import target')
+    if format is None:
+        content_type = request.headers.get('content-type', '').split(';')[0].strip()
+        format = 'ndjson' if content_type in NDJSON_TYPES else 'csv'
+    if int(request.headers.get('content-length') or 0) > IMPORT_MAX_BYTES:
+        raise too_large_exception
+
+    upload = tempfile.NamedTemporaryFile(prefix=f'import_{entity}_', suffix=f'.{format}', delete=False)
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > IMPORT_MAX_BYTES:
+                raise too_large_exception
+            await run_in_threadpool(upload.write, chunk)
+    except Exception:
+        upload.close()
+        os.remove(upload.name)
+        raise
+    upload.close()
+
+    try:
+        job_id = await start_import(entity, upload.name, format)
+    except Exception:
+        os.remove(upload.name)
+        raise
+    return {'job_id': job_id, 'status': 'pending'}
+
+
+@import_router.get('/jobs/{job_id}')
+async def import_status(job_id: str):
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail='Import job not found')
+    return job
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from delivery_app.metrics import render
+
+metrics_router = APIRouter(tags=['Monitoring'])
+
+
+@metrics_router.get('/metrics', include_in_schema=False)
+async def metrics():
+    body, content_type = render()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+from delivery_app.db.database import engine
+from delivery_app.db.pool import pool_stats
+from delivery_app.db.query_stats import endpoint_stats
+from delivery_app.cache import local_cache
+from delivery_app.janitor import janitor
+from delivery_app.locations import location_buffer
+from delivery_app.tracking import registry
+
+monitoring_router = APIRouter(prefix='/monitoring', tags=['Monitoring'])
+
+
+@monitoring_router.get('/db_pool')
+async def db_pool():
+    return pool_stats.snapshot(engine.pool)
+
+
+@monitoring_router.get('/queries')
+async def query_stats():
+    return endpoint_stats.snapshot()
+
+
+@monitoring_router.get('/cache')
+async def cache_stats():
+    return local_cache.stats()
+
+
+@monitoring_router.get('/janitor')
+async def janitor_stats():
+    return janitor.stats
+
+
+@monitoring_router.get('/locations')
+async def location_stats():
+    return location_buffer.stats
+
+
+@monitoring_router.get('/tracking')
+async def tracking_stats():
+    return registry.stats
@@ -1,64 +1,65 @@
-from fastapi import Depends, HTTPException, APIRouter
-from sqlalchemy.orm import Session
-from delivery_app.db.models import Order, Courier
-from delivery_app.db.schema import OrderSchema
-from delivery_app.db.database import SessionLocal
-from typing import List
+from fastapi import Depends, HTTPException, APIRouter, Header
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.db.models import Order
+from delivery_app.db.schema import (OrderSchema, OrderUpdateSchema, OrderCreateSchema, OrderDetailSchema,
+                                   CurrentUserSchema, Page)
+from delivery_app.db.database import get_db
+from delivery_app.db.crud import update_returning, delete_returning
+from delivery_app.api.pagination import PageParams, paginate
+from delivery_app.security import get_current_user
+from delivery_app.idempotency import idempotent
+from delivery_app.orders import place_order
+from typing import Optional
 
 order_router = APIRouter(prefix='/order', tags=['Order'])
 
-async def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
+@order_router.post('/create', response_model=OrderDetailSchema, status_code=201)
+async def order_create(order: OrderCreateSchema, idempotency_key: Optional[str] = Header(None, max_length=255),
+                       current_user: CurrentUserSchema = Depends(get_current_user),
+                       db: AsyncSession = Depends(get_db)):
+    async def run():
+        order_db = await place_order(db, current_user.id, order)
+        return OrderDetailSchema.model_validate(order_db, from_attributes=True).model_dump_json()
 
-@order_router.post('/create')
-async def order_create(order: OrderSchema, db: Session = Depends(get_db)):
-    order_db = Courier(**order.dict())
-    db.add(order_db)
-    db.commit()
-    db.refresh(order_db)
-    return order_db
+    return await idempotent(f'order:{current_user.id}', idempotency_key, order.model_dump_json(), run,
+                            status_code=201)
 
 
-@order_router.get('/', response_model=List[OrderSchema])
-async def order_list(db: Session = Depends(get_db)):
-    return db.query(Order).all()
+@order_router.get('/', response_model=Page[OrderSchema])
+async def order_list(page: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    return await paginate(db, select(Order), page, Order.id)
 
 
-@order_router.get('/{order_id}', response_model=List[OrderSchema])
-async def order_detail(order_id: int, db: Session = Depends(get_db)):
-    order = db.query(Order).filter(Order.id==order_id).first()
+@order_router.get('/{order_id}', response_model=OrderSchema)
+async def order_detail(order_id: int, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Order).where(Order.id == order_id))
+    order = result.scalars().first()
 
     if order is None:
         raise HTTPException(status_code=400, detail='Мындай маалымат жок')
     return order
 
 @order_router.put('/{order_id}', response_model=OrderSchema)
-async def update_order(order_id: int, order: OrderSchema, db: Session = Depends(get_db)):
-    order_db = db.query(Order).filter(Order.id==order_id).first()
+async def update_order(order_id: int, order: OrderSchema, db: AsyncSession = Depends(get_db)):
+    values = order.model_dump(exclude={'id', 'status', 'courier_id', 'version'})
+    order_db = await update_returning(db, Order, order_id, {**values, 'version': Order.version + 1},
+                                       'такого заказа не существует')
+    return order_db
 
-    if order_db is None:
-        raise HTTPException(status_code=404, detail='такого заказа не существует')
-    for order_key, order_value in order.dict().items():
-        setattr(order_db, order_key, order_value)
 
-    db.add(order_db)
-    db.commit()
-    db.refresh(order_db)
+@order_router.patch('/{order_id}', response_model=OrderSchema)
+async def patch_order(order_id: int, order: OrderUpdateSchema, db: AsyncSession = Depends(get_db)):
+    values = order.model_dump(exclude_unset=True, exclude_none=True)
+    if values:
+        values['version'] = Order.version + 1
+    order_db = await update_returning(db, Order, order_id, values, 'такого заказа не существует')
     return order_db
 
 
 @order_router.delete('/{order_id}')
-async def delete_order(order_id: int, db: Session = Depends(get_db)):
-    order = db.query(Order).filter(Order.id==order_id).first()
-    if order is None:
-        raise HTTPException(status_code=404, detail='такого заказа не существует')
-
-    db.delete(order)
-    db.commit()
+async def delete_order(order_id: int, db: AsyncSession = Depends(get_db)):
+    await delete_returning(db, Order, order_id, 'такого заказа не существует')
     return {"message": 'This order deleted'}
 
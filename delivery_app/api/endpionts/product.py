@@ -1,81 +1,98 @@
-from fastapi import Depends, HTTPException, APIRouter, Query
-from sqlalchemy.orm import Session
-from delivery_app.db.models import Product
-from delivery_app.db.schema import ProductSchema
-from delivery_app.db.database import SessionLocal
-from typing import List, Optional
+from fastapi import Depends, HTTPException, APIRouter, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.db.models import Product, Store
+from delivery_app.db.schema import ProductSchema, ProductUpdateSchema, Page, BulkResultSchema
+from delivery_app.db.database import get_db
+from delivery_app.db.crud import update_returning, delete_returning
+from delivery_app.api.pagination import PageParams, paginate
+from delivery_app.cache import cached, cache_key, invalidate
+from delivery_app.api.bulk import BulkParams, bulk_create
+from typing import Optional
 
 product_router = APIRouter(prefix='/product', tags=['Product'])
 
-async def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 
 @product_router.post('/create')
-async def product_create(product: ProductSchema, db: Session = Depends(get_db)):
+async def product_create(product: ProductSchema, db: AsyncSession = Depends(get_db)):
     product_db = Product(**product.dict())
     db.add(product_db)
-    db.commit()
-    db.refresh(product_db)
+    await db.commit()
+    await db.refresh(product_db)
+    await invalidate('product:list')
     return product_db
 
 
-@product_router.get('/', response_model=List[ProductSchema])
+@product_router.post('/bulk', response_model=BulkResultSchema)
+async def product_bulk_create(request: Request, params: BulkParams = Depends(), db: AsyncSession = Depends(get_db)):
+    result = await bulk_create(request, db, ProductSchema, Product, {'store_id': Store.id}, params)
+    await invalidate('product')
+    return result
+
+
+@product_router.get('/', response_model=Page[ProductSchema])
 async def list_product(
     min_price: Optional[float] = Query(None, alias='price[from]'),
     max_price: Optional[float] = Query(None, alias='price[to]'),
-    db: Session = Depends(get_db)
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Product)
+    async def load():
+        query = select(Product)
+        keys = (Product.id,)
+
+        if min_price is not None:
+            query = query.where(Product.price >= min_price)
+        if max_price is not None:
+            query = query.where(Product.price <= max_price)
+        if min_price is not None or max_price is not None:
+            keys = (Product.price, Product.id)
+        products = await paginate(db, query, page, *keys)
 
-    if min_price is not None:
-        query = query.filter(Product.price >= min_price)
-    if max_price is not None:
-        query = query.filter(Product.price <= max_price)
-    products = query.all()
+        if not products['items'] and page.cursor is None:
+            raise HTTPException(status_code=404, detail='Products not found')
+        return products
 
-    if not products:
-        raise HTTPException(status_code=404, detail='Products not found')
-    return products
+    return await cached(cache_key('product', 'list', min_price, max_price, page.cursor, page.limit),
+                        Page[ProductSchema], load, tags=['product', 'product:list'])
 
 
 
 @product_router.get('/{product_id}/', response_model=ProductSchema)
-async def product_detail(product_id: int,db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.id == product_id).first()
+async def product_detail(product_id: int,db: AsyncSession = Depends(get_db)):
+    async def load():
+        result = await db.execute(select(Product).where(Product.id == product_id))
+        product = result.scalars().first()
 
-    if product is None:
-        raise  HTTPException(status_code=400, detail='Мындай маалымат жок')
-    return product
+        if product is None:
+            raise  HTTPException(status_code=400, detail='Мындай маалымат жок')
+        return product
+
+    return await cached(cache_key('product', product_id), ProductSchema, load,
+                        tags=['product', f'product:{product_id}'])
 
 
 @product_router.put('/{product_id}', response_model=ProductSchema)
-async def update_product(product_id: int, product: ProductSchema, db: Session = Depends(get_db)):
-    product_db = db.query(Product).filter(Product.id==product_id).first()
+async def update_product(product_id: int, product: ProductSchema, db: AsyncSession = Depends(get_db)):
+    product_db = await update_returning(db, Product, product_id, product.model_dump(exclude={'id'}),
+                                         'такого продукта не существует')
+    await invalidate('product:list', f'product:{product_id}')
+    return product_db
 
-    if product_db is None:
-        raise HTTPException(status_code=404, detail='такого продукта не существует')
-    for product_key, product_value in product.dict().items():
-        setattr(product_db, product_key, product_value)
 
-    db.add(product_db)
-    db.commit()
-    db.refresh(product_db)
+@product_router.patch('/{product_id}', response_model=ProductSchema)
+async def patch_product(product_id: int, product: ProductUpdateSchema, db: AsyncSession = Depends(get_db)):
+    product_db = await update_returning(db, Product, product_id,
+                                         product.model_dump(exclude_unset=True, exclude_none=True),
+                                         'такого продукта не существует')
+    await invalidate('product:list', f'product:{product_id}')
     return product_db
 
 
 @product_router.delete('/{product_id}')
-async def delete_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.id==product_id).first()
-    if product is None:
-        raise HTTPException(status_code=404, detail='такого продукта не существует')
-
-    db.delete(product)
-    db.commit()
+async def delete_product(product_id: int, db: AsyncSession = Depends(get_db)):
+    await delete_returning(db, Product, product_id, 'такого продукта не существует')
+    await invalidate('product:list', f'product:{product_id}')
     return {"message": 'This product deleted'}
 
 
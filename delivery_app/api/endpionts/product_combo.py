@@ -1,65 +1,77 @@
-from fastapi import Depends, HTTPException, APIRouter
-from sqlalchemy.orm import Session
-from delivery_app.db.models import ProductCombo
-from delivery_app.db.schema import ProductComboSchema
-from delivery_app.db.database import SessionLocal
-from typing import List
+from fastapi import Depends, HTTPException, APIRouter, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.db.models import ProductCombo, Store, Category
+from delivery_app.db.schema import ProductComboSchema, ProductComboUpdateSchema, Page, BulkResultSchema
+from delivery_app.db.database import get_db
+from delivery_app.db.crud import update_returning, delete_returning
+from delivery_app.api.pagination import PageParams, paginate
+from delivery_app.cache import cached, cache_key, invalidate
+from delivery_app.api.bulk import BulkParams, bulk_create
 
 product_combo_router = APIRouter(prefix='/product_combo', tags=['Product_combo'])
 
-async def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @product_combo_router.post('/create')
-async def product_combo_create(product_combo: ProductComboSchema, db: Session = Depends(get_db)):
+async def product_combo_create(product_combo: ProductComboSchema, db: AsyncSession = Depends(get_db)):
     product_combo_db = ProductCombo(**product_combo.dict())
     db.add(product_combo_db)
-    db.commit()
-    db.refresh(product_combo_db)
+    await db.commit()
+    await db.refresh(product_combo_db)
+    await invalidate('product_combo:list', f'product_combo:{product_combo_db.id}')
     return product_combo_db
 
 
-@product_combo_router.get('/', response_model=List[ProductComboSchema])
-async def product_combo_list(db: Session = Depends(get_db)):
-    return db.query(ProductCombo).all()
+@product_combo_router.post('/bulk', response_model=BulkResultSchema)
+async def product_combo_bulk_create(request: Request, params: BulkParams = Depends(),
+                                    db: AsyncSession = Depends(get_db)):
+    result = await bulk_create(request, db, ProductComboSchema, ProductCombo,
+                               {'store_id': Store.id, 'category_id': Category.id}, params)
+    await invalidate('product_combo')
+    return result
+
+
+@product_combo_router.get('/', response_model=Page[ProductComboSchema])
+async def product_combo_list(page: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    return await cached(cache_key('product_combo', 'list', page.cursor, page.limit), Page[ProductComboSchema],
+                        lambda: paginate(db, select(ProductCombo), page, ProductCombo.id),
+                        tags=['product_combo', 'product_combo:list'])
+
 
+@product_combo_router.get('/{product_combo_id}', response_model=ProductComboSchema)
+async def product_combo_detail(product_combo_id: int, db: AsyncSession = Depends(get_db)):
+    async def load():
+        result = await db.execute(select(ProductCombo).where(ProductCombo.id == product_combo_id))
+        product_combo = result.scalars().first()
 
-@product_combo_router.get('/{product_combo_id}', response_model=List[ProductComboSchema])
-async def product_combo_detail(product_combo_id: int, db: Session = Depends(get_db)):
-    product_combo = db.query(ProductCombo).filter(ProductCombo.id==product_combo_id).first()
+        if product_combo is None:
+            raise HTTPException(status_code=400, detail='Мындай маалымат жок')
+        return product_combo
 
-    if product_combo is None:
-        raise HTTPException(status_code=400, detail='Мындай маалымат жок')
-    return product_combo
+    return await cached(cache_key('product_combo', product_combo_id), ProductComboSchema, load,
+                        tags=['product_combo', f'product_combo:{product_combo_id}'])
 
 
 
 @product_combo_router.put('/{product_combo_id}', response_model=ProductComboSchema)
-async def update_product_combo(product_combo_id: int, product_combo: ProductComboSchema, db: Session = Depends(get_db)):
-    product_combo_db = db.query(ProductCombo).filter(ProductCombo.id==product_combo_id).first()
+async def update_product_combo(product_combo_id: int, product_combo: ProductComboSchema, db: AsyncSession = Depends(get_db)):
+    product_combo_db = await update_returning(db, ProductCombo, product_combo_id, product_combo.model_dump(exclude={'id'}),
+                                               'такого продукта не существует')
+    await invalidate('product_combo:list', f'product_combo:{product_combo_id}')
+    return product_combo_db
 
-    if product_combo_db is None:
-        raise HTTPException(status_code=404, detail='такого продукта не существует')
-    for product_combo_key, product_combo_value in product_combo.dict().items():
-        setattr(product_combo_db, product_combo_key, product_combo_value)
 
-    db.add(product_combo_db)
-    db.commit()
-    db.refresh(product_combo_db)
+@product_combo_router.patch('/{product_combo_id}', response_model=ProductComboSchema)
+async def patch_product_combo(product_combo_id: int, product_combo: ProductComboUpdateSchema, db: AsyncSession = Depends(get_db)):
+    product_combo_db = await update_returning(db, ProductCombo, product_combo_id,
+                                               product_combo.model_dump(exclude_unset=True, exclude_none=True),
+                                               'такого продукта не существует')
+    await invalidate('product_combo:list', f'product_combo:{product_combo_id}')
     return product_combo_db
 
 
 @product_combo_router.delete('/{product_combo_id}')
-async def delete_product_combo(product_combo_id: int, db: Session = Depends(get_db)):
-    product_combo = db.query(ProductCombo).filter(ProductCombo.id==product_combo_id).first()
-    if product_combo is None:
-        raise HTTPException(status_code=404, detail='такого комбо не существует')
-
-    db.delete(product_combo)
-    db.commit()
+async def delete_product_combo(product_combo_id: int, db: AsyncSession = Depends(get_db)):
+    await delete_returning(db, ProductCombo, product_combo_id, 'такого комбо не существует')
+    await invalidate('product_combo:list', f'product_combo:{product_combo_id}')
     return {"message": 'This combo deleted'}
 
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from delivery_app.profiling import profiles, find_profile, profile_summary, render_profile, require_profiling_admin
+
+profiling_router = APIRouter(prefix='/monitoring/profiles', tags=['Monitoring'],
+                             dependencies=[Depends(require_profiling_admin)])
+
+
+@profiling_router.get('/')
+async def profile_list():
+    return [profile_summary(profile) for profile in reversed(profiles)]
+
+
+@profiling_router.get('/{profile_id}')
+async def profile_download(profile_id: str, format: str = Query('speedscope', pattern='^(speedscope|html|text)$')):
+    profile = find_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail='Profile not found')
+    body, media_type = render_profile(profile, format)
+    headers = {}
+    if format == 'speedscope':
+        headers['Content-Disposition'] = f'attachment; filename="profile-{profile_id}.speedscope.json"'
+    return Response(content=body, media_type=media_type, headers=headers)
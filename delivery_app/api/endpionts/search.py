@@ -0,0 +1,54 @@
+from fastapi import Depends, APIRouter, Query
+from sqlalchemy import select, func, or_, case, literal, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.db.models import Store, Product, ProductCombo
+from delivery_app.db.schema import SearchResultSchema
+from delivery_app.db.database import get_db
+from delivery_app.config import SEARCH_SIMILARITY_THRESHOLD
+from typing import List
+
+search_router = APIRouter(prefix='/search', tags=['Search'])
+
+
+def escape_like(term: str):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+async def set_similarity_threshold(db: AsyncSession):
+    await db.execute(select(func.set_config('pg_trgm.word_similarity_threshold', str(SEARCH_SIMILARITY_THRESHOLD), True)))
+
+
+def match(term: str, name_column, description_column=None):
+    prefix = escape_like(term) + '%'
+    rank = func.word_similarity(term, name_column) + case((name_column.ilike(prefix, escape='\\'), 0.5), else_=0.0)
+    condition = or_(name_column.op('%>')(term), name_column.ilike(prefix, escape='\\'))
+    if description_column is not None:
+        rank = func.greatest(rank, func.word_similarity(term, description_column) * 0.5)
+        condition = or_(condition, description_column.op('%>')(term))
+    return rank, condition
+
+
+def ranked(kind: str, model, id_column, name_column, store_column, term: str, description_column=None):
+    rank, condition = match(term, name_column, description_column)
+    return (
+        select(literal(kind).label('kind'), id_column.label('id'), name_column.label('title'),
+               store_column.label('store_id'), rank.label('rank'))
+        .select_from(model)
+        .where(condition)
+    )
+
+
+@search_router.get('/', response_model=List[SearchResultSchema])
+async def search(q: str = Query(..., min_length=2, max_length=64),
+                 limit: int = Query(20, ge=1, le=50),
+                 db: AsyncSession = Depends(get_db)):
+    term = q.strip()
+    await set_similarity_threshold(db)
+
+    query = union_all(
+        ranked('store', Store, Store.id, Store.store_name, Store.id, term, Store.description),
+        ranked('product', Product, Product.id, Product.product_name, Product.store_id, term),
+        ranked('combo', ProductCombo, ProductCombo.id, ProductCombo.combo_name, ProductCombo.store_id, term),
+    ).subquery()
+    result = await db.execute(select(query).order_by(query.c.rank.desc(), query.c.id).limit(limit))
+    return result.mappings().all()
@@ -1,71 +1,124 @@
-from fastapi import Depends, HTTPException, APIRouter
-from sqlalchemy.orm import Session
-from delivery_app.db.models import Store
-from delivery_app.db.schema import StoreSchema
-from delivery_app.db.database import SessionLocal
-from typing import List
+from fastapi import Depends, HTTPException, APIRouter, Request, Query
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.db.models import Store, Category, UserProfile
+from delivery_app.db.schema import StoreSchema, StoreUpdateSchema, StoreFullSchema, Page, BulkResultSchema
+from delivery_app.db.database import get_db
+from delivery_app.db.crud import update_returning, delete_returning
+from delivery_app.api.pagination import PageParams, paginate
+from delivery_app.cache import cached, cache_key, invalidate
+from delivery_app.api.bulk import BulkParams, bulk_create
+from delivery_app.api.etag import etag_response
+from delivery_app.api.endpionts.search import match, set_similarity_threshold
+from typing import List, Optional
 
 store_router = APIRouter(prefix='/store', tags=['Store'])
 
-async def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+STORE_SECTIONS = {
+    'contacts': Store.contact_store,
+    'products': Store.product_store,
+    'combos': Store.store_combo_name,
+    'reviews': Store.user_store_review,
+}
 
 @store_router.get('/search/', response_model=List[StoreSchema])
-async def search_store(store_name: str, db: Session = Depends(get_db)):
-    store_db = db.query(Store).filter(Store.store_name.ilike(f'%{store_name}%')).all()
+async def search_store(store_name: str = Query(..., min_length=2, max_length=64),
+                       limit: int = Query(20, ge=1, le=50),
+                       db: AsyncSession = Depends(get_db)):
+    term = store_name.strip()
+    await set_similarity_threshold(db)
+    rank, condition = match(term, Store.store_name)
+    result = await db.execute(select(Store).where(condition).order_by(rank.desc(), Store.id).limit(limit))
+    store_db = result.scalars().all()
     if not store_db:
         raise HTTPException(status_code=404, detail='Store Not Found')
     return store_db
 
 
 @store_router.post('/create')
-async def store_create(store: StoreSchema, db: Session = Depends(get_db)):
+async def store_create(store: StoreSchema, db: AsyncSession = Depends(get_db)):
     store_db = Store(**store.dict())
     db.add(store_db)
-    db.commit()
-    db.refresh(store_db)
+    await db.commit()
+    await db.refresh(store_db)
+    await invalidate('store:list')
     return store_db
 
 
-@store_router.get('/', response_model=List[StoreSchema])
-async def store_list(db: Session = Depends(get_db)):
-    return db.query(Store).all()
+@store_router.post('/bulk', response_model=BulkResultSchema)
+async def store_bulk_create(request: Request, params: BulkParams = Depends(), db: AsyncSession = Depends(get_db)):
+    result = await bulk_create(request, db, StoreSchema, Store,
+                               {'category_id': Category.id, 'owner_id': UserProfile.id}, params)
+    await invalidate('store')
+    return result
 
 
-@store_router.get('/{store_id}', response_model=List[StoreSchema])
-async def store_detail(store_id: int, db: Session = Depends(get_db)):
-    store = db.query(Store).filter(Store.id==store_id).first()
+@store_router.get('/', response_model=Page[StoreSchema])
+async def store_list(page: PageParams = Depends(), db: AsyncSession = Depends(get_db)):
+    return await cached(cache_key('store', 'list', page.cursor, page.limit), Page[StoreSchema],
+                        lambda: paginate(db, select(Store), page, Store.id),
+                        tags=['store', 'store:list'])
+
+
+@store_router.get('/{store_id}', response_model=StoreSchema)
+async def store_detail(store_id: int, db: AsyncSession = Depends(get_db)):
+    async def load():
+        result = await db.execute(select(Store).where(Store.id == store_id))
+        store = result.scalars().first()
+
+        if store is None:
+            raise HTTPException(status_code=400, detail='Мындай маалымат жок')
+        return store
+
+    return await cached(cache_key('store', store_id), StoreSchema, load,
+                        tags=['store', f'store:{store_id}'])
+
+
+@store_router.get('/{store_id}/full', response_model=StoreFullSchema)
+async def store_full(store_id: int, request: Request, include: Optional[str] = None,
+                     db: AsyncSession = Depends(get_db)):
+    sections = list(STORE_SECTIONS) if include is None else [s.strip() for s in include.split(',') if s.strip()]
+    unknown = set(sections) - set(STORE_SECTIONS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f'Unknown sections: {", ".join(sorted(unknown))}')
+
+    query = select(Store).where(Store.id == store_id)
+    query = query.options(*(selectinload(STORE_SECTIONS[section]) for section in sections))
+    result = await db.execute(query)
+    store = result.scalars().first()
 
     if store is None:
-        raise HTTPException(status_code=400, detail='Мындай маалымат жок')
+        raise HTTPException(status_code=404, detail='Мындай маалымат жок')
+
+    data = StoreSchema.model_validate(store, from_attributes=True).model_dump()
+    for section in sections:
+        children = getattr(store, STORE_SECTIONS[section].key)
+        data[section] = sorted(children, key=lambda child: child.id)
+    full = StoreFullSchema.model_validate(data, from_attributes=True)
+    return etag_response(request, full.model_dump_json(exclude_unset=True).encode())
 
 
 @store_router.put('/{store_id}', response_model=StoreSchema)
-async def update_store(store_id: int, store: StoreSchema, db: Session = Depends(get_db)):
-    store_db = db.query(Store).filter(Store.id==store_id).first()
+async def update_store(store_id: int, store: StoreSchema, db: AsyncSession = Depends(get_db)):
+    store_db = await update_returning(db, Store, store_id, store.model_dump(exclude={'id'}),
+                                       'такого категории не существует')
+    await invalidate('store:list', f'store:{store_id}')
+    return store_db
 
-    if store_db is None:
-        raise HTTPException(status_code=404, detail='такого категории не существует')
-    for store_key, store_value in store.dict().items():
-        setattr(store_db, store_key, store_value)
 
-    db.add(store_db)
-    db.commit()
-    db.refresh(store_db)
+@store_router.patch('/{store_id}', response_model=StoreSchema)
+async def patch_store(store_id: int, store: StoreUpdateSchema, db: AsyncSession = Depends(get_db)):
+    store_db = await update_returning(db, Store, store_id,
+                                       store.model_dump(exclude_unset=True, exclude_none=True),
+                                       'такого категории не существует')
+    await invalidate('store:list', f'store:{store_id}')
     return store_db
 
 
 @store_router.delete('/{store_id}')
-async def delete_store(store_id: int, db: Session = Depends(get_db)):
-    store = db.query(Store).filter(Store.id==store_id).first()
-    if store is None:
-        raise HTTPException(status_code=404, detail='такого категории не существует')
-
-    db.delete(store)
-    db.commit()
+async def delete_store(store_id: int, db: AsyncSession = Depends(get_db)):
+    await delete_returning(db, Store, store_id, 'такого категории не существует')
+    await invalidate('store:list', f'store:{store_id}', 'product', 'product_combo')
     return {"message": 'This category deleted'}
 
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.db.database import SessionLocal, get_db
+from delivery_app.db.models import Order
+from delivery_app.locations import POSITIONS_KEY
+from delivery_app.redis_client import get_redis
+from delivery_app.tracking import HEARTBEAT, registry, order_event
+
+tracking_router = APIRouter(prefix='/order', tags=['Tracking'])
+
+
+async def load_order(order_id: int):
+    async with SessionLocal() as db:
+        result = await db.execute(select(Order).where(Order.id == order_id))
+        return result.scalars().first()
+
+
+async def snapshot(order):
+    messages = [order_event(order)]
+    client = get_redis()
+    if order.courier_id is not None and client is not None:
+        try:
+            position = await client.hget(POSITIONS_KEY, order.courier_id)
+        except RedisError:
+            position = None
+        if position is not None:
+            position = json.loads(position)
+            messages.append({'type': 'position', 'order_id': order.id, 'courier_id': order.courier_id,
+                             'lat': position['lat'], 'lon': position['lon']})
+    return messages
+
+
+def sse_event(message: dict):
+    return f'event: {message["type"]}\ndata: {json.dumps(message)}\n\n'
+
+
+async def watch_disconnect(websocket: WebSocket, connection):
+    try:
+        while (await websocket.receive())['type'] != 'websocket.disconnect':
+            pass
+    finally:
+        connection.closed.set()
+
+
+@tracking_router.websocket('/{order_id}/ws')
+async def track_order_ws(websocket: WebSocket, order_id: int):
+    connection = registry.register(order_id, 'websocket')
+    try:
+        order = await load_order(order_id)
+        if order is None:
+            await websocket.close(code=1008)
+            return
+        registry.assign(order_id, order.courier_id)
+        await websocket.accept()
+        for message in await snapshot(order):
+            await websocket.send_json(message)
+
+        watcher = asyncio.create_task(watch_disconnect(websocket, connection))
+        try:
+            while True:
+                message = await connection.next_message()
+                if message is None:
+                    break
+                await websocket.send_json(message)
+        finally:
+            watcher.cancel()
+        if connection.slow:
+            await websocket.close(code=1013)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        registry.unregister(connection)
+
+
+@tracking_router.get('/{order_id}/events')
+async def track_order_sse(order_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Order).where(Order.id == order_id))
+    order = result.scalars().first()
+    if order is None:
+        raise HTTPException(status_code=404, detail='такого заказа не существует')
+
+    async def stream():
+        connection = registry.register(order_id, 'sse')
+        try:
+            registry.assign(order_id, order.courier_id)
+            for message in await snapshot(order):
+                yield sse_event(message)
+            while True:
+                message = await connection.next_message()
+                if message is None:
+                    return
+                if message is HEARTBEAT:
+                    if await request.is_disconnected():
+                        return
+                    yield ': ping\n\n'
+                    continue
+                yield sse_event(message)
+        finally:
+            registry.unregister(connection)
+
+    return StreamingResponse(stream(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
@@ -0,0 +1,22 @@
+import hashlib
+from fastapi import Request, Response
+
+
+def make_etag(body: bytes):
+    return '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+def etag_matches(request: Request, etag: str):
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix('W/') for value in header.split(',')}
+    return '*' in candidates or etag in candidates
+
+
+def etag_response(request: Request, body: bytes, media_type: str = 'application/json'):
+    etag = make_etag(body)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
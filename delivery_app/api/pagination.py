@@ -0,0 +1,49 @@
+import base64
+import binascii
+import json
+from decimal import InvalidOperation
+from typing import Optional
+from fastapi import HTTPException, Query
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MAX_PAGE_SIZE = 100
+
+
+class PageParams:
+    def __init__(self, cursor: Optional[str] = Query(None),
+                 limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE)):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def encode_cursor(values: list):
+    raw = json.dumps(values, default=str, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, columns):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [column.type.python_type(value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError, InvalidOperation, binascii.Error):
+        raise HTTPException(status_code=400, detail='Invalid cursor')
+
+
+async def paginate(db: AsyncSession, query, page: PageParams, *columns):
+    if page.cursor:
+        values = decode_cursor(page.cursor, columns)
+        if len(columns) == 1:
+            query = query.where(columns[0] > values[0])
+        else:
+            query = query.where(tuple_(*columns) > tuple(values))
+    result = await db.execute(query.order_by(*columns).limit(page.limit + 1))
+    items = result.scalars().all()
+
+    next_cursor = None
+    if len(items) > page.limit:
+        items = items[:page.limit]
+        next_cursor = encode_cursor([getattr(items[-1], column.key) for column in columns])
+    return {'items': items, 'next_cursor': next_cursor}
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from functools import lru_cache
+from fastapi import Response
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+from delivery_app.config import CACHE_TTL_SECONDS, CACHE_LOCK_TIMEOUT_MS, LOCAL_CACHE_SIZE, LOCAL_CACHE_TTL_SECONDS
+from delivery_app.local_cache import LRUCache
+from delivery_app.redis_client import get_redis, listen
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'cache:'
+TAG_PREFIX = 'cache:tag:'
+LOCK_PREFIX = 'cache:lock:'
+LOCK_POLL_SECONDS = 0.05
+INVALIDATION_CHANNEL = 'cache:invalidate'
+
+local_cache = LRUCache(LOCAL_CACHE_SIZE, LOCAL_CACHE_TTL_SECONDS)
+local_tags = defaultdict(set)
+
+RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def cache_key(entity: str, *parts):
+    return ':'.join([entity, *('' if part is None else str(part) for part in parts)])
+
+
+@lru_cache(maxsize=None)
+def adapter_for(model):
+    return TypeAdapter(model)
+
+
+def serialize(model, value):
+    adapter = adapter_for(model)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True)).decode()
+
+
+def json_response(body: str):
+    return Response(content=body, media_type='application/json')
+
+
+def local_set(key: str, body: str, tags, ttl: int):
+    local_cache.set(key, body, min(ttl, LOCAL_CACHE_TTL_SECONDS))
+    for tag in tags:
+        keys = local_tags[tag]
+        keys.add(key)
+        if len(keys) > 2 * local_cache.maxsize:
+            keys.intersection_update(local_cache.data)
+
+
+def local_invalidate(tags):
+    for tag in tags:
+        for key in local_tags.pop(tag, ()):
+            local_cache.pop(key)
+
+
+async def wait_for_fill(client, redis_key: str):
+    for _ in range(CACHE_LOCK_TIMEOUT_MS // int(LOCK_POLL_SECONDS * 1000)):
+        await asyncio.sleep(LOCK_POLL_SECONDS)
+        body = await client.get(redis_key)
+        if body is not None:
+            return body
+    return None
+
+
+async def store(client, redis_key: str, body: str, tags, ttl: int):
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.set(redis_key, body, ex=ttl)
+        for tag in tags:
+            pipe.sadd(TAG_PREFIX + tag, redis_key)
+            pipe.expire(TAG_PREFIX + tag, ttl)
+        await pipe.execute()
+
+
+async def cached(key: str, model, loader, tags=(), ttl: int = CACHE_TTL_SECONDS):
+    body = local_cache.get(key)
+    if body is not None:
+        return json_response(body)
+
+    client = get_redis()
+    if client is None:
+        return json_response(serialize(model, await loader()))
+
+    redis_key = KEY_PREFIX + key
+    lock_key = LOCK_PREFIX + key
+    token = uuid.uuid4().hex
+    locked = False
+    try:
+        body = await client.get(redis_key)
+        if body is not None:
+            local_set(key, body, tags, ttl)
+            return json_response(body)
+        locked = await client.set(lock_key, token, nx=True, px=CACHE_LOCK_TIMEOUT_MS)
+        if not locked:
+            body = await wait_for_fill(client, redis_key)
+            if body is not None:
+                local_set(key, body, tags, ttl)
+                return json_response(body)
+    except RedisError as e:
+        logger.warning('cache read failed for %s: %s', key, e)
+        return json_response(serialize(model, await loader()))
+
+    try:
+        body = serialize(model, await loader())
+        await store(client, redis_key, body, tags, ttl)
+        local_set(key, body, tags, ttl)
+        return json_response(body)
+    except RedisError as e:
+        logger.warning('cache write failed for %s: %s', key, e)
+        return json_response(body)
+    finally:
+        if locked:
+            try:
+                await client.eval(RELEASE_LOCK, 1, lock_key, token)
+            except RedisError:
+                pass
+
+
+async def invalidate(*tags: str):
+    local_invalidate(tags)
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.smembers(TAG_PREFIX + tag)
+            members = await pipe.execute()
+        keys = set().union(*members)
+        if keys:
+            await client.delete(*keys)
+        await client.delete(*(TAG_PREFIX + tag for tag in tags))
+        await client.publish(INVALIDATION_CHANNEL, json.dumps(tags))
+    except RedisError as e:
+        logger.warning('cache invalidation failed for %s: %s', tags, e)
+
+
+async def on_invalidation(channel: str, data: str):
+    local_invalidate(json.loads(data))
+
+
+def start_invalidation_listener():
+    return asyncio.create_task(listen([INVALIDATION_CHANNEL], on_invalidation))
@@ -0,0 +1,25 @@
+from fastapi import HTTPException
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def update_returning(db: AsyncSession, model, object_id: int, values: dict, detail: str):
+    if values:
+        query = update(model).where(model.id == object_id).values(**values).returning(model)
+    else:
+        query = select(model).where(model.id == object_id)
+    result = await db.execute(query)
+    obj = result.scalars().first()
+
+    if obj is None:
+        raise HTTPException(status_code=404, detail=detail)
+    await db.commit()
+    return obj
+
+
+async def delete_returning(db: AsyncSession, model, object_id: int, detail: str):
+    result = await db.execute(delete(model).where(model.id == object_id).returning(model.id))
+
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail=detail)
+    await db.commit()
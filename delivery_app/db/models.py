@@ -1,10 +1,14 @@
-from sqlalchemy import Integer, String, Enum, ForeignKey, Text, DECIMAL, DateTime
+from sqlalchemy import Integer, BigInteger, String, Enum, ForeignKey, Text, DECIMAL, DateTime, Float, Index, text
 from delivery_app.db.database import Base
 from typing import Optional, List
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from enum import Enum as PyEnum
 from datetime import datetime
-from passlib.hash import bcrypt
+from delivery_app.passwords import get_password_hash, verify_password
+
+
+def trgm_index(name: str, column: str):
+    return Index(name, column, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
 
 
 class StatusChoices(str, PyEnum):
@@ -27,31 +31,34 @@ class UserProfile(Base):
     status: Mapped[StatusChoices] = mapped_column(Enum(StatusChoices), nullable=False, default=StatusChoices.client)
     date_registered: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     owner_store: Mapped[List['Store']] = relationship('Store', back_populates='owner',
-                                                      cascade='all, delete-orphan')
+                                                      cascade='all, delete-orphan', passive_deletes=True)
     courier_name: Mapped[List['Courier']] = relationship('Courier', back_populates='courier',
-                                                         cascade='all, delete-orphan')
+                                                         cascade='all, delete-orphan', passive_deletes=True)
     client_order_name: Mapped[List['Order']] = relationship('Order', back_populates='client_order',
-                                                            cascade='all, delete-orphan')
+                                                            cascade='all, delete-orphan', passive_deletes=True)
     user_name_review: Mapped[List['ReviewStore']] = relationship('ReviewStore', back_populates='user_name',
-                                                                 cascade='all, delete-orphan')
+                                                                 cascade='all, delete-orphan', passive_deletes=True)
     user_review_product: Mapped[List['ReviewProduct']] = relationship('ReviewProduct', back_populates='user_name_product',
-                                                              cascade='all, delete-orphan')
+                                                              cascade='all, delete-orphan', passive_deletes=True)
     tokens: Mapped[List['RefreshToken']] = relationship('RefreshToken', back_populates='user',
-                                                        cascade='all, delete-orphan')
+                                                        cascade='all, delete-orphan', passive_deletes=True)
 
-    def set_passwords(self, password: str):
-        self.hash_password = bcrypt.hash(password)
+    async def set_passwords(self, password: str):
+        self.hash_password = await get_password_hash(password)
 
-    def check_password(self, password: str):
-        return bcrypt.verify(password, self.hash_password)
+    async def check_password(self, password: str):
+        valid, new_hash = await verify_password(password, self.hash_password)
+        if new_hash:
+            self.hash_password = new_hash
+        return valid
 
 class RefreshToken(Base):
     __tablename__ = 'refresh_token'
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     token: Mapped[str] = mapped_column(String, unique=True, index=True)
-    created_date: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    user_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id'))
+    created_date: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id', ondelete='CASCADE'), index=True)
     user: Mapped['UserProfile'] = relationship('UserProfile', back_populates='tokens')
 
 class Category(Base):
@@ -60,31 +67,37 @@ class Category(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     category_name: Mapped[str] = mapped_column(String(32), unique=True)
     category_store: Mapped[List['Store']] = relationship('Store', back_populates='category',
-                                                          cascade='all, delete-orphan')
+                                                          cascade='all, delete-orphan', passive_deletes=True)
     category_combo_name: Mapped[List['ProductCombo']] = relationship('ProductCombo', back_populates='category_combo',
-                                                          cascade='all, delete-orphan')
+                                                          cascade='all, delete-orphan', passive_deletes=True)
 
 
 class Store(Base):
 
     __tablename__ = 'store'
+    __table_args__ = (
+        trgm_index('ix_store_store_name_trgm', 'store_name'),
+        trgm_index('ix_store_description_trgm', 'description'),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     store_name: Mapped[str] = mapped_column(String(32))
-    category_id: Mapped[int] = mapped_column(ForeignKey('category.id'))
+    category_id: Mapped[int] = mapped_column(ForeignKey('category.id', ondelete='CASCADE'), index=True)
     category: Mapped[Category] = relationship(Category, back_populates='category_store')
     description: Mapped[str] = mapped_column(Text)
     store_image: Mapped[str] = mapped_column(String)
     address: Mapped[str] = mapped_column(String)
-    owner_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id'))
+    latitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    longitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    owner_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id', ondelete='CASCADE'), index=True)
     owner: Mapped[UserProfile] = relationship(UserProfile, back_populates='owner_store')
     contact_store: Mapped[List['Contact']] = relationship('Contact', back_populates='store',
-                                                          cascade='all, delete-orphan')
+                                                          cascade='all, delete-orphan', passive_deletes=True)
     product_store: Mapped[List['Product']] = relationship('Product', back_populates='stores',
-                                                          cascade='all, delete-orphan')
+                                                          cascade='all, delete-orphan', passive_deletes=True)
     store_combo_name: Mapped[List['ProductCombo']] = relationship('ProductCombo', back_populates='store_combo',
-                                                                  cascade='all, delete-orphan')
+                                                                  cascade='all, delete-orphan', passive_deletes=True)
     user_store_review: Mapped[List['ReviewStore']] = relationship('ReviewStore', back_populates='store_review',
-                                                                  cascade='all, delete-orphan')
+                                                                  cascade='all, delete-orphan', passive_deletes=True)
 
 
 class Contact(Base):
@@ -94,39 +107,47 @@ class Contact(Base):
     title: Mapped[str] = mapped_column(String(32))
     contact_number: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     social_network: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    store_id: Mapped[int] = mapped_column(ForeignKey('store.id'))
+    store_id: Mapped[int] = mapped_column(ForeignKey('store.id', ondelete='CASCADE'), index=True)
     store: Mapped[Store] = relationship(Store, back_populates='contact_store')
 
 
 class Product(Base):
 
     __tablename__ = 'product'
+    __table_args__ = (
+        trgm_index('ix_product_product_name_trgm', 'product_name'),
+        Index('ix_product_store_id_price', 'store_id', 'price'),
+        Index('ix_product_price_id', 'price', 'id'),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     product_name: Mapped[str] = mapped_column(String(64))
     description: Mapped[str] = mapped_column(Text)
     product_image: Mapped[str] = mapped_column(String)
     price: Mapped[float] = mapped_column(DECIMAL(10, 2))
-    store_id: Mapped[Store] = mapped_column(ForeignKey('store.id'))
+    store_id: Mapped[Store] = mapped_column(ForeignKey('store.id', ondelete='CASCADE'))
     stores: Mapped[Store] = relationship(Store, back_populates='product_store')
     product_order: Mapped[List['Courier']] = relationship('Courier', back_populates='product_current_orders',
-                                                          cascade='all, delete-orphan')
+                                                          cascade='all, delete-orphan', passive_deletes=True)
     user_product_review: Mapped[List['ReviewProduct']] = relationship('ReviewProduct', back_populates='product_review',
-                                                          cascade='all, delete-orphan')
+                                                          cascade='all, delete-orphan', passive_deletes=True)
 
 class ProductCombo(Base):
 
     __tablename__ = 'product_combo'
+    __table_args__ = (
+        trgm_index('ix_product_combo_combo_name_trgm', 'combo_name'),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     combo_name: Mapped[str] = mapped_column(String(64))
     description: Mapped[str] = mapped_column(Text)
     combo_image: Mapped[str] = mapped_column(String)
     price: Mapped[float] = mapped_column(DECIMAL(10, 2))
-    store_id: Mapped[Store] = mapped_column(ForeignKey('store.id'))
+    store_id: Mapped[Store] = mapped_column(ForeignKey('store.id', ondelete='CASCADE'), index=True)
     store_combo: Mapped[Store] = relationship(Store, back_populates='store_combo_name')
-    category_id: Mapped[int] = mapped_column(ForeignKey('category.id'))
+    category_id: Mapped[int] = mapped_column(ForeignKey('category.id', ondelete='CASCADE'), index=True)
     category_combo: Mapped[Category] = relationship(Category, back_populates='category_combo_name')
     product_combo_order: Mapped[List['Courier']] = relationship('Courier', back_populates='combo_current_orders',
-                                                                cascade='all, delete-orphan')
+                                                                cascade='all, delete-orphan', passive_deletes=True)
 
 class StatusCourierChoices(str, PyEnum):
     available = 'available'
@@ -136,14 +157,30 @@ class Courier(Base):
 
     __tablename__ = 'courier'
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    courier_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id'))
+    courier_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id', ondelete='CASCADE'), index=True)
     courier: Mapped[UserProfile] = relationship(UserProfile, back_populates='courier_name')
-    product_current_orders_id: Mapped[int] = mapped_column(ForeignKey('product.id'))
+    product_current_orders_id: Mapped[int] = mapped_column(ForeignKey('product.id', ondelete='CASCADE'), index=True)
     product_current_orders: Mapped[Product] = relationship(Product, back_populates='product_order')
-    combo_current_orders_id: Mapped[int] = mapped_column(ForeignKey('product_combo.id'))
+    combo_current_orders_id: Mapped[int] = mapped_column(ForeignKey('product_combo.id', ondelete='CASCADE'), index=True)
     combo_current_orders: Mapped[ProductCombo] = relationship(ProductCombo, back_populates='product_combo_order')
-    status_choices: Mapped[StatusCourierChoices] = mapped_column(Enum(StatusCourierChoices), nullable=False, default=StatusCourierChoices.available)
-    # courier_order: Mapped['Order'] = relationship('Order')
+    status_choices: Mapped[StatusCourierChoices] = mapped_column(Enum(StatusCourierChoices), nullable=False, default=StatusCourierChoices.available, index=True)
+    latitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    longitude: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    location_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    orders: Mapped[List['Order']] = relationship('Order', back_populates='courier', passive_deletes=True)
+
+
+class CourierLocation(Base):
+
+    __tablename__ = 'courier_location'
+    __table_args__ = (
+        Index('ix_courier_location_courier_id_recorded_at', 'courier_id', 'recorded_at'),
+    )
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    courier_id: Mapped[int] = mapped_column(ForeignKey('courier.id', ondelete='CASCADE'))
+    latitude: Mapped[float] = mapped_column(Float)
+    longitude: Mapped[float] = mapped_column(Float)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime, index=True)
 
 
 class StatusOrderChoices(str, PyEnum):
@@ -156,23 +193,50 @@ class StatusOrderChoices(str, PyEnum):
 class Order(Base):
 
     __tablename__ = 'order'
+    __table_args__ = (
+        Index('ix_order_client_id_created_date', 'client_id', 'created_date'),
+        Index('ix_order_status_created_date', 'status', 'created_date'),
+        Index('ix_order_awaiting_dispatch', 'created_date', 'id',
+              postgresql_where=text("status = 'awaiting_processing' AND courier_id IS NULL")),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     status: Mapped[StatusOrderChoices] = mapped_column(Enum(StatusOrderChoices), nullable=False, default=StatusOrderChoices.awaiting_processing)
     delivery_address: Mapped[str] = mapped_column(String(256))
-    client_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id'))
+    created_date: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow,
+                                                   server_default=text("timezone('utc', now())"), index=True)
+    client_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id', ondelete='CASCADE'))
     client_order: Mapped[UserProfile] = relationship(UserProfile, back_populates='client_order_name')
-    # courier_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id'))
-    # courier: Mapped[UserProfile] = relationship('UserProfile', back_populates='courier_order')
+    courier_id: Mapped[Optional[int]] = mapped_column(ForeignKey('courier.id', ondelete='SET NULL'), nullable=True,
+                                                      index=True)
+    courier: Mapped[Optional[Courier]] = relationship(Courier, back_populates='orders')
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default=text('1'))
+    total_price: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False, default=0, server_default=text('0'))
+    items: Mapped[List['OrderItem']] = relationship('OrderItem', back_populates='order',
+                                                    cascade='all, delete-orphan', passive_deletes=True)
+
 
+class OrderItem(Base):
+
+    __tablename__ = 'order_item'
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    order_id: Mapped[int] = mapped_column(ForeignKey('order.id', ondelete='CASCADE'), index=True)
+    order: Mapped[Order] = relationship(Order, back_populates='items')
+    product_id: Mapped[Optional[int]] = mapped_column(ForeignKey('product.id', ondelete='SET NULL'), nullable=True,
+                                                      index=True)
+    product_combo_id: Mapped[Optional[int]] = mapped_column(ForeignKey('product_combo.id', ondelete='SET NULL'),
+                                                            nullable=True, index=True)
+    title: Mapped[str] = mapped_column(String(64))
+    unit_price: Mapped[float] = mapped_column(DECIMAL(10, 2))
+    quantity: Mapped[int] = mapped_column(Integer)
 
 
 class ReviewStore(Base):
 
     __tablename__ = 'review_store'
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_name_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id'))
+    user_name_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id', ondelete='CASCADE'), index=True)
     user_name: Mapped[UserProfile] = relationship(UserProfile, back_populates='user_name_review')
-    store_id: Mapped[int] = mapped_column(ForeignKey('store.id'))
+    store_id: Mapped[int] = mapped_column(ForeignKey('store.id', ondelete='CASCADE'), index=True)
     store_review: Mapped[Store] = relationship(Store, back_populates='user_store_review')
 
 
@@ -180,7 +244,7 @@ class ReviewProduct(Base):
 
     __tablename__ = 'review_product'
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_name_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id'))
+    user_name_id: Mapped[int] = mapped_column(ForeignKey('user_profile.id', ondelete='CASCADE'), index=True)
     user_name_product: Mapped[UserProfile] = relationship(UserProfile, back_populates='user_review_product')
-    product_id: Mapped[int] = mapped_column(ForeignKey('product.id'))  # Изменено на правильную таблицу
+    product_id: Mapped[int] = mapped_column(ForeignKey('product.id', ondelete='CASCADE'), index=True)  # Изменено на правильную таблицу
     product_review: Mapped[Product] = relationship(Product, back_populates='user_product_review')
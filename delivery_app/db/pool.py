@@ -0,0 +1,85 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from delivery_app.config import DB_SLOW_CHECKOUT_MS
+from delivery_app.metrics import DB_POOL_CHECKED_OUT, DB_POOL_OVERFLOW, DB_POOL_WAIT
+
+logger = logging.getLogger(__name__)
+
+request_wait: ContextVar[Optional[dict]] = ContextVar('db_pool_request_wait', default=None)
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def observe_wait(self, seconds: float):
+        self.checkouts += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+        DB_POOL_WAIT.observe(seconds)
+
+        holder = request_wait.get()
+        if holder is not None:
+            holder['checkouts'] += 1
+            holder['wait'] += seconds
+        if seconds * 1000 >= DB_SLOW_CHECKOUT_MS:
+            logger.warning('slow pool checkout: %.1f ms', seconds * 1000)
+
+    def snapshot(self, pool):
+        return {
+            'pool_size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'overflow_events': self.overflow_events,
+            'checkouts': self.checkouts,
+            'checkout_wait_avg_ms': self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0,
+            'checkout_wait_max_ms': self.wait_max * 1000,
+        }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.observe_wait(time.perf_counter() - started)
+
+
+def track_request():
+    holder = {'checkouts': 0, 'wait': 0.0}
+    request_wait.set(holder)
+    return holder
+
+
+def update_pool_gauges(pool):
+    DB_POOL_CHECKED_OUT.set(pool.checkedout())
+    DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+
+def install_pool_events(engine):
+    pool = engine.sync_engine.pool
+
+    @event.listens_for(pool, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        if pool.overflow() > 0:
+            pool_stats.overflow_events += 1
+
+    @event.listens_for(pool, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        update_pool_gauges(pool)
+
+    @event.listens_for(pool, 'checkin')
+    def on_checkin(dbapi_connection, connection_record):
+        update_pool_gauges(pool)
@@ -0,0 +1,96 @@
+import logging
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from delivery_app.config import DB_SLOW_QUERY_MS
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_LOG_LENGTH = 500
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement = None
+
+    def observe(self, statement: str, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.slowest:
+            self.slowest = seconds
+            self.slowest_statement = statement
+
+
+class EndpointStats:
+    def __init__(self):
+        self.routes = defaultdict(lambda: {'requests': 0, 'queries': 0, 'max_queries': 0,
+                                           'db_time': 0.0, 'app_time': 0.0, 'slowest_ms': 0.0,
+                                           'slowest_statement': None})
+
+    def observe(self, route: str, stats: QueryStats, app_seconds: float):
+        entry = self.routes[route]
+        entry['requests'] += 1
+        entry['queries'] += stats.count
+        entry['max_queries'] = max(entry['max_queries'], stats.count)
+        entry['db_time'] += stats.total
+        entry['app_time'] += app_seconds
+        if stats.slowest * 1000 > entry['slowest_ms']:
+            entry['slowest_ms'] = stats.slowest * 1000
+            entry['slowest_statement'] = stats.slowest_statement[:STATEMENT_LOG_LENGTH]
+
+    def snapshot(self):
+        routes = []
+        for route, entry in self.routes.items():
+            requests = entry['requests']
+            routes.append({
+                'route': route,
+                'requests': requests,
+                'queries_avg': entry['queries'] / requests,
+                'queries_max': entry['max_queries'],
+                'db_avg_ms': entry['db_time'] / requests * 1000,
+                'app_avg_ms': entry['app_time'] / requests * 1000,
+                'slowest_ms': entry['slowest_ms'],
+                'slowest_statement': entry['slowest_statement'],
+            })
+        return sorted(routes, key=lambda r: r['db_avg_ms'] * r['requests'], reverse=True)
+
+
+request_queries: ContextVar[Optional[QueryStats]] = ContextVar('db_request_queries', default=None)
+endpoint_stats = EndpointStats()
+
+
+def track_queries():
+    stats = QueryStats()
+    request_queries.set(stats)
+    return stats
+
+
+def param_shape(parameters):
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return f'{len(parameters)} x {param_shape(parameters[0])}'
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def install_query_events(engine):
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info['query_started'].pop()
+        stats = request_queries.get()
+        if stats is not None:
+            stats.observe(statement, seconds)
+        if seconds * 1000 >= DB_SLOW_QUERY_MS:
+            logger.warning('slow query: %.1f ms %s params=%s', seconds * 1000,
+                           ' '.join(statement.split())[:STATEMENT_LOG_LENGTH], param_shape(parameters))
@@ -1,8 +1,10 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel
+from typing import Optional, List, Generic, TypeVar
+from pydantic import BaseModel, Field, model_validator
 from delivery_app.db.models import StatusChoices, StatusCourierChoices, StatusOrderChoices
 
+T = TypeVar('T')
+
 
 class UserProfileSchema(BaseModel):
     id: int
@@ -17,11 +19,21 @@ class UserProfileSchema(BaseModel):
     date_registered: datetime
 
 
+class CurrentUserSchema(BaseModel):
+    id: int
+    username: str
+    status: StatusChoices
+
+
 class CategorySchema(BaseModel):
     id: int
     category_name: str
 
 
+class CategoryUpdateSchema(BaseModel):
+    category_name: Optional[str] = None
+
+
 class StoreSchema(BaseModel):
     id: int
     store_name: str
@@ -30,6 +42,55 @@ class StoreSchema(BaseModel):
     store_image: str
     address: str
     owner_id: int
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+
+class StoreUpdateSchema(BaseModel):
+    store_name: Optional[str] = None
+    category_id: Optional[int] = None
+    description: Optional[str] = None
+    store_image: Optional[str] = None
+    address: Optional[str] = None
+    owner_id: Optional[int] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+
+class StoreContactSchema(BaseModel):
+    id: int
+    title: str
+    contact_number: Optional[str]
+    social_network: Optional[str]
+
+
+class StoreProductSchema(BaseModel):
+    id: int
+    product_name: str
+    description: str
+    product_image: str
+    price: float
+
+
+class StoreComboSchema(BaseModel):
+    id: int
+    combo_name: str
+    description: str
+    combo_image: str
+    price: float
+    category_id: int
+
+
+class StoreReviewSchema(BaseModel):
+    id: int
+    user_name_id: int
+
+
+class StoreFullSchema(StoreSchema):
+    contacts: Optional[List[StoreContactSchema]] = None
+    products: Optional[List[StoreProductSchema]] = None
+    combos: Optional[List[StoreComboSchema]] = None
+    reviews: Optional[List[StoreReviewSchema]] = None
 
 
 class ContactSchema(BaseModel):
@@ -49,6 +110,14 @@ class ProductSchema(BaseModel):
     store_id: int
 
 
+class ProductUpdateSchema(BaseModel):
+    product_name: Optional[str] = None
+    description: Optional[str] = None
+    product_image: Optional[str] = None
+    price: Optional[float] = None
+    store_id: Optional[int] = None
+
+
 class ProductComboSchema(BaseModel):
     id: int
     combo_name: str
@@ -59,6 +128,15 @@ class ProductComboSchema(BaseModel):
     category_id: int
 
 
+class ProductComboUpdateSchema(BaseModel):
+    combo_name: Optional[str] = None
+    description: Optional[str] = None
+    combo_image: Optional[str] = None
+    price: Optional[float] = None
+    store_id: Optional[int] = None
+    category_id: Optional[int] = None
+
+
 class CourierSchema(BaseModel):
     id: int
     courier_id: int
@@ -67,11 +145,80 @@ class CourierSchema(BaseModel):
     status_choices: StatusCourierChoices
 
 
+class CourierUpdateSchema(BaseModel):
+    courier_id: Optional[int] = None
+    product_current_orders_id: Optional[int] = None
+    combo_current_orders_id: Optional[int] = None
+
+
+class CourierLocationSchema(BaseModel):
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+
+
+class LocationPingSchema(BaseModel):
+    courier_id: int
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+    recorded_at: Optional[datetime] = None
+
+
+class NearestCourierSchema(BaseModel):
+    courier_id: int
+    distance_km: float
+    latitude: float
+    longitude: float
+
+
 class OrderSchema(BaseModel):
     id: int
     status: StatusOrderChoices
     delivery_address: str
     client_id: int
+    courier_id: Optional[int] = None
+    version: Optional[int] = None
+
+
+class OrderUpdateSchema(BaseModel):
+    delivery_address: Optional[str] = None
+    client_id: Optional[int] = None
+
+
+class OrderItemCreateSchema(BaseModel):
+    product_id: Optional[int] = None
+    product_combo_id: Optional[int] = None
+    quantity: int = Field(1, ge=1, le=100)
+
+    @model_validator(mode='after')
+    def check_one_target(self):
+        if (self.product_id is None) == (self.product_combo_id is None):
+            raise ValueError('Set exactly one of product_id or product_combo_id')
+        return self
+
+
+class OrderCreateSchema(BaseModel):
+    delivery_address: str = Field(max_length=256)
+    items: List[OrderItemCreateSchema] = Field(min_length=1, max_length=100)
+
+
+class OrderItemSchema(BaseModel):
+    id: int
+    product_id: Optional[int]
+    product_combo_id: Optional[int]
+    title: str
+    unit_price: float
+    quantity: int
+
+
+class OrderDetailSchema(OrderSchema):
+    total_price: float
+    created_date: datetime
+    items: List[OrderItemSchema]
+
+
+class OrderTransitionSchema(BaseModel):
+    status: StatusOrderChoices
+    version: int
 
 
 class ReviewStoreSchema(BaseModel):
@@ -84,3 +231,28 @@ class ReviewProductSchema(BaseModel):
     id: int
     user_name_id: int
     product_id: int
+
+
+class SearchResultSchema(BaseModel):
+    kind: str
+    id: int
+    title: str
+    store_id: int
+    rank: float
+
+
+class BulkRowErrorSchema(BaseModel):
+    index: int
+    errors: list
+
+
+class BulkResultSchema(BaseModel):
+    created: int
+    ids: List[int]
+    skipped: List[int]
+    errors: List[BulkRowErrorSchema]
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
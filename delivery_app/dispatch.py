@@ -0,0 +1,91 @@
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.db.models import Order, Courier, StatusOrderChoices, StatusCourierChoices
+from delivery_app.geo import publish_courier
+from delivery_app.tracking import publish_order
+
+TRANSITIONS = {
+    StatusOrderChoices.awaiting_processing: {StatusOrderChoices.during_the_delivery_process,
+                                             StatusOrderChoices.cancelled},
+    StatusOrderChoices.during_the_delivery_process: {StatusOrderChoices.delivered, StatusOrderChoices.cancelled},
+    StatusOrderChoices.delivered: set(),
+    StatusOrderChoices.cancelled: set(),
+}
+
+FINAL_STATUSES = {status for status, targets in TRANSITIONS.items() if not targets}
+
+
+def sources_for(target: StatusOrderChoices):
+    return [status for status, targets in TRANSITIONS.items() if target in targets]
+
+
+def next_awaiting_order():
+    return (select(Order.id)
+            .where(Order.status == StatusOrderChoices.awaiting_processing, Order.courier_id.is_(None))
+            .order_by(Order.created_date, Order.id)
+            .limit(1)
+            .with_for_update(skip_locked=True))
+
+
+async def claim_next_order(db: AsyncSession, courier_id: int):
+    result = await db.execute(select(Courier.status_choices).where(Courier.id == courier_id).with_for_update())
+    courier_status = result.scalar_one_or_none()
+    if courier_status is None:
+        raise HTTPException(status_code=404, detail='такого курьера не существует')
+    if courier_status != StatusCourierChoices.available:
+        raise HTTPException(status_code=409, detail='Courier is already delivering an order')
+
+    order_id = (await db.execute(next_awaiting_order())).scalar_one_or_none()
+    if order_id is None:
+        await db.rollback()
+        return None
+
+    result = await db.execute(
+        update(Order)
+        .where(Order.id == order_id)
+        .values(status=StatusOrderChoices.during_the_delivery_process, courier_id=courier_id,
+                version=Order.version + 1)
+        .returning(Order)
+    )
+    order = result.scalars().one()
+    await db.execute(update(Courier).where(Courier.id == courier_id)
+                     .values(status_choices=StatusCourierChoices.employed))
+    await db.commit()
+    await publish_courier(courier_id, None, None, available=False)
+    await publish_order(order)
+    return order
+
+
+async def transition_order(db: AsyncSession, order_id: int, status: StatusOrderChoices, version: int):
+    if status == StatusOrderChoices.during_the_delivery_process:
+        raise HTTPException(status_code=409, detail='Orders go into delivery only when a courier claims them')
+    result = await db.execute(
+        update(Order)
+        .where(Order.id == order_id, Order.version == version, Order.status.in_(sources_for(status)))
+        .values(status=status, version=Order.version + 1)
+        .returning(Order)
+    )
+    order = result.scalars().first()
+
+    if order is None:
+        await db.rollback()
+        result = await db.execute(select(Order.status, Order.version).where(Order.id == order_id))
+        current = result.first()
+        if current is None:
+            raise HTTPException(status_code=404, detail='такого заказа не существует')
+        if current.version != version:
+            raise HTTPException(status_code=409, detail=f'Order was modified, current version is {current.version}')
+        raise HTTPException(status_code=409, detail=f'Cannot move order from {current.status.value} to {status.value}')
+
+    freed = None
+    if status in FINAL_STATUSES and order.courier_id is not None:
+        result = await db.execute(update(Courier).where(Courier.id == order.courier_id)
+                                  .values(status_choices=StatusCourierChoices.available)
+                                  .returning(Courier.latitude, Courier.longitude))
+        freed = result.first()
+    await db.commit()
+    if freed is not None:
+        await publish_courier(order.courier_id, freed.latitude, freed.longitude, available=True)
+    await publish_order(order)
+    return order
@@ -0,0 +1,173 @@
+import asyncio
+import heapq
+import json
+import logging
+import math
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from delivery_app.config import GEO_CELL_DEGREES, GEO_MAX_RADIUS_KM
+from delivery_app.db.database import SessionLocal
+from delivery_app.db.models import Courier, StatusCourierChoices
+from delivery_app.redis_client import get_redis, listen
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+LOCATION_CHANNEL = 'courier:location'
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class GridIndex:
+    def __init__(self, cell_degrees: float = GEO_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.cells = {}
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, item_id):
+        return item_id in self.positions
+
+    def cell(self, lat: float, lon: float):
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def update(self, item_id, lat: float, lon: float):
+        cell = self.cell(lat, lon)
+        previous = self.positions.get(item_id)
+        if previous is not None and previous[2] != cell:
+            self.discard_from_cell(item_id, previous[2])
+        self.positions[item_id] = (lat, lon, cell)
+        self.cells.setdefault(cell, set()).add(item_id)
+
+    def remove(self, item_id):
+        previous = self.positions.pop(item_id, None)
+        if previous is not None:
+            self.discard_from_cell(item_id, previous[2])
+
+    def discard_from_cell(self, item_id, cell):
+        members = self.cells.get(cell)
+        if members is not None:
+            members.discard(item_id)
+            if not members:
+                del self.cells[cell]
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+
+    def ring(self, ci: int, cj: int, r: int):
+        if r == 0:
+            yield ci, cj
+            return
+        for j in range(cj - r, cj + r + 1):
+            yield ci - r, j
+            yield ci + r, j
+        for i in range(ci - r + 1, ci + r):
+            yield i, cj - r
+            yield i, cj + r
+
+    def nearest(self, lat: float, lon: float, k: int, max_km: float = GEO_MAX_RADIUS_KM):
+        ci, cj = self.cell(lat, lon)
+        lon_scale = max(math.cos(math.radians(lat)), 0.01)
+        cell_side = self.cell_degrees * lon_scale
+        max_degrees = max_km / KM_PER_DEGREE
+        limit = max_degrees * max_degrees
+        max_ring = math.ceil(max_degrees / cell_side) + 1
+        fi = lat / self.cell_degrees - ci
+        fj = lon / self.cell_degrees - cj
+        edge = min(min(fi, 1 - fi) * self.cell_degrees, min(fj, 1 - fj) * cell_side)
+        positions = self.positions
+        heap = []
+        for r in range(max_ring + 1):
+            if r and len(heap) == k and (edge + (r - 1) * cell_side) ** 2 > -heap[0][0]:
+                break
+            for cell in self.ring(ci, cj, r):
+                members = self.cells.get(cell)
+                if not members:
+                    continue
+                for item_id in members:
+                    item_lat, item_lon, _ = positions[item_id]
+                    dx = (item_lon - lon) * lon_scale
+                    dy = item_lat - lat
+                    distance = dx * dx + dy * dy
+                    if distance > limit:
+                        continue
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-distance, item_id))
+                    elif distance < -heap[0][0]:
+                        heapq.heapreplace(heap, (-distance, item_id))
+        results = []
+        for _, item_id in sorted(heap, reverse=True):
+            item_lat, item_lon, _ = positions[item_id]
+            results.append((item_id, haversine_km(lat, lon, item_lat, item_lon)))
+        return results
+
+
+courier_index = GridIndex()
+available_couriers = set()
+
+
+def apply_courier(courier_id: int, latitude, longitude, available: bool):
+    if available:
+        available_couriers.add(courier_id)
+    else:
+        available_couriers.discard(courier_id)
+    if available and latitude is not None and longitude is not None:
+        courier_index.update(courier_id, latitude, longitude)
+    else:
+        courier_index.remove(courier_id)
+
+
+def move_couriers(positions):
+    for courier_id, latitude, longitude in positions:
+        if courier_id in available_couriers:
+            courier_index.update(courier_id, latitude, longitude)
+
+
+async def publish_courier(courier_id: int, latitude, longitude, available: bool):
+    apply_courier(courier_id, latitude, longitude, available)
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.publish(LOCATION_CHANNEL, json.dumps({'id': courier_id, 'lat': latitude, 'lon': longitude,
+                                                           'available': available}))
+    except RedisError as e:
+        logger.warning('courier location publish failed for %s: %s', courier_id, e)
+
+
+async def on_courier_event(channel: str, data: str):
+    event = json.loads(data)
+    if 'positions' in event:
+        move_couriers(event['positions'])
+    else:
+        apply_courier(event['id'], event['lat'], event['lon'], event['available'])
+
+
+async def load_couriers():
+    async with SessionLocal() as db:
+        result = await db.execute(
+            select(Courier.id, Courier.latitude, Courier.longitude)
+            .where(Courier.status_choices == StatusCourierChoices.available)
+        )
+        rows = result.all()
+    courier_index.clear()
+    available_couriers.clear()
+    for courier_id, latitude, longitude in rows:
+        available_couriers.add(courier_id)
+        if latitude is not None and longitude is not None:
+            courier_index.update(courier_id, latitude, longitude)
+    logger.info('courier index loaded with %d available couriers', len(courier_index))
+
+
+def start_courier_listener():
+    return asyncio.create_task(listen([LOCATION_CHANNEL], on_courier_event))
@@ -0,0 +1,65 @@
+import hashlib
+import json
+import logging
+from fastapi import HTTPException, Response
+from redis.exceptions import RedisError
+from delivery_app.config import IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_LOCK_SECONDS
+from delivery_app.redis_client import redis_or_503
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'idempotency:'
+
+
+def fingerprint(body: str):
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def replay(record: dict):
+    return Response(content=record['body'], status_code=record['status'], media_type='application/json',
+                    headers={'Idempotent-Replayed': 'true'})
+
+
+async def idempotent(scope: str, key, body: str, run, status_code: int = 200):
+    if key is None:
+        return Response(content=await run(), status_code=status_code, media_type='application/json')
+
+    client = redis_or_503()
+    redis_key = f'{KEY_PREFIX}{scope}:{key}'
+    digest = fingerprint(body)
+    try:
+        acquired = await client.set(redis_key, json.dumps({'state': 'pending', 'fingerprint': digest}),
+                                    nx=True, ex=IDEMPOTENCY_LOCK_SECONDS)
+        if not acquired:
+            stored = await client.get(redis_key)
+    except RedisError as e:
+        logger.warning('idempotency lookup failed for %s: %s', redis_key, e)
+        raise HTTPException(status_code=503, detail='Redis is unavailable')
+
+    if not acquired:
+        if stored is None:
+            raise HTTPException(status_code=409, detail='Request with this Idempotency-Key is being retried',
+                                headers={'Retry-After': '1'})
+        record = json.loads(stored)
+        if record['fingerprint'] != digest:
+            raise HTTPException(status_code=422, detail='Idempotency-Key was already used with a different request')
+        if record['state'] == 'pending':
+            raise HTTPException(status_code=409, detail='Request with this Idempotency-Key is still in progress',
+                                headers={'Retry-After': '1'})
+        return replay(record)
+
+    try:
+        result = await run()
+    except BaseException:
+        try:
+            await client.delete(redis_key)
+        except RedisError as e:
+            logger.warning('idempotency release failed for %s: %s', redis_key, e)
+        raise
+
+    record = {'state': 'done', 'fingerprint': digest, 'status': status_code, 'body': result}
+    try:
+        await client.set(redis_key, json.dumps(record), ex=IDEMPOTENCY_TTL_SECONDS)
+    except RedisError as e:
+        logger.warning('idempotency store failed for %s: %s', redis_key, e)
+    return Response(content=result, status_code=status_code, media_type='application/json')
@@ -0,0 +1,201 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from pydantic import ValidationError
+from sqlalchemy import Numeric, text
+from delivery_app.cache import invalidate
+from delivery_app.config import IMPORT_CHUNK_SIZE, IMPORT_MAX_ERRORS, IMPORT_JOB_TTL_SECONDS, IMPORT_MAX_ROWS
+from delivery_app.db.database import engine
+from delivery_app.db.models import Product, ProductCombo
+from delivery_app.db.schema import ProductSchema, ProductComboSchema
+from delivery_app.redis_client import redis_or_503
+
+logger = logging.getLogger(__name__)
+
+JOB_PREFIX = 'import:job:'
+LINE_COLUMN = 'import_line'
+
+IMPORT_TARGETS = {
+    'product': (ProductSchema, Product, {'store_id': 'store'}),
+    'product_combo': (ProductComboSchema, ProductCombo, {'store_id': 'store', 'category_id': 'category'}),
+}
+
+import_tasks = set()
+
+
+class ImportJob:
+    def __init__(self, job_id: str, entity: str):
+        self.job_id = job_id
+        self.entity = entity
+        self.rows_read = 0
+        self.rows_valid = 0
+        self.rows_invalid = 0
+        self.rows_merged = 0
+        self.rows_orphaned = 0
+        self.errors = []
+
+    def add_error(self, line: int, errors):
+        self.rows_invalid += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def add_orphan(self, line: int, errors):
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    async def save(self, **fields):
+        client = redis_or_503()
+        key = JOB_PREFIX + self.job_id
+        await client.hset(key, mapping={
+            'entity': self.entity,
+            'rows_read': self.rows_read,
+            'rows_valid': self.rows_valid,
+            'rows_invalid': self.rows_invalid,
+            'rows_merged': self.rows_merged,
+            'rows_orphaned': self.rows_orphaned,
+            'errors': json.dumps(self.errors),
+            **fields,
+        })
+        await client.expire(key, IMPORT_JOB_TTL_SECONDS)
+
+
+async def get_job(job_id: str):
+    job = await redis_or_503().hgetall(JOB_PREFIX + job_id)
+    if not job:
+        return None
+    job['errors'] = json.loads(job.get('errors', '[]'))
+    for field in ('rows_read', 'rows_valid', 'rows_invalid', 'rows_merged', 'rows_orphaned'):
+        job[field] = int(job.get(field, 0))
+    return {'job_id': job_id, **job}
+
+
+def read_records(path: str, fmt: str):
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                yield line, row
+        else:
+            for line, raw in enumerate(f, start=1):
+                if raw.strip():
+                    try:
+                        yield line, json.loads(raw)
+                    except ValueError as e:
+                        yield line, e
+
+
+def validate_chunk(records, schema, columns, numeric, job: ImportJob):
+    rows = []
+    for line, record in records:
+        job.rows_read += 1
+        if isinstance(record, Exception):
+            job.add_error(line, [{'msg': str(record)}])
+            continue
+        try:
+            data = schema.model_validate(record).model_dump()
+        except ValidationError as e:
+            job.add_error(line, json.loads(e.json(include_url=False)))
+            continue
+        rows.append(tuple(Decimal(str(data[c])) if c in numeric else data[c] for c in columns) + (line,))
+    job.rows_valid += len(rows)
+    return rows
+
+
+def next_chunk(records):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            break
+    return chunk
+
+
+def latest_rows(stage: str):
+    return f'(SELECT DISTINCT ON (id) * FROM {stage} ORDER BY id, ctid DESC) s'
+
+
+def reference_exists(field: str, ref: str):
+    return f'EXISTS (SELECT 1 FROM {ref} WHERE {ref}.id = s.{field})'
+
+
+def orphan_statement(stage: str, references: dict):
+    checks = ' AND '.join(reference_exists(field, ref) for field, ref in references.items())
+    found = ', '.join(f'{field}, {reference_exists(field, ref)} AS {field}_exists' for field, ref in references.items())
+    return text(
+        f'SELECT {LINE_COLUMN} AS line, {found}, count(*) OVER () AS total FROM {latest_rows(stage)} '
+        f'WHERE NOT ({checks}) '
+        f'ORDER BY {LINE_COLUMN} LIMIT {IMPORT_MAX_ERRORS}'
+    )
+
+
+def merge_statement(table: str, stage: str, columns, references: dict):
+    column_list = ', '.join(columns)
+    updates = ', '.join(f'{c} = EXCLUDED.{c}' for c in columns if c != 'id')
+    checks = ' AND '.join(reference_exists(field, ref) for field, ref in references.items())
+    return text(
+        f'INSERT INTO {table} ({column_list}) '
+        f'SELECT {column_list} FROM {latest_rows(stage)} '
+        f'WHERE {checks} '
+        f'ON CONFLICT (id) DO UPDATE SET {updates}'
+    )
+
+
+async def report_orphans(conn, job: ImportJob, stage: str, references: dict):
+    result = await conn.execute(orphan_statement(stage, references))
+    for row in result.mappings():
+        job.rows_orphaned = row['total']
+        job.add_orphan(row['line'], [
+            {'loc': [field], 'msg': f'{ref} {row[field]} does not exist'}
+            for field, ref in references.items() if not row[f'{field}_exists']
+        ])
+
+
+async def run_import(job: ImportJob, path: str, fmt: str):
+    schema, model, references = IMPORT_TARGETS[job.entity]
+    table = model.__tablename__
+    stage = f'import_{table}'
+    columns = [c for c in schema.model_fields if c in model.__table__.c]
+    numeric = {c for c in columns if isinstance(model.__table__.c[c].type, Numeric)}
+    records = read_records(path, fmt)
+
+    await job.save(status='running', started_at=datetime.utcnow().isoformat())
+    try:
+        async with engine.connect() as conn:
+            async with conn.begin():
+                await conn.execute(text(f'CREATE TEMP TABLE {stage} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP'))
+                await conn.execute(text(f'ALTER TABLE {stage} ADD COLUMN {LINE_COLUMN} integer'))
+                raw = (await conn.get_raw_connection()).driver_connection
+                while True:
+                    chunk = await asyncio.to_thread(next_chunk, records)
+                    if not chunk:
+                        break
+                    if job.rows_read + len(chunk) > IMPORT_MAX_ROWS:
+                        raise ValueError(f'import is limited to {IMPORT_MAX_ROWS} rows')
+                    rows = await asyncio.to_thread(validate_chunk, chunk, schema, columns, numeric, job)
+                    if rows:
+                        await raw.copy_records_to_table(stage, records=rows, columns=columns + [LINE_COLUMN])
+                    await job.save(status='running')
+                await report_orphans(conn, job, stage, references)
+                result = await conn.execute(merge_statement(table, stage, columns, references))
+                job.rows_merged = result.rowcount
+        await invalidate(table)
+        await job.save(status='done', finished_at=datetime.utcnow().isoformat())
+    except Exception as e:
+        logger.exception('import job %s failed', job.job_id)
+        await job.save(status='failed', error=str(e), finished_at=datetime.utcnow().isoformat())
+    finally:
+        records.close()
+        os.remove(path)
+
+
+async def start_import(entity: str, path: str, fmt: str):
+    job = ImportJob(uuid.uuid4().hex, entity)
+    await job.save(status='pending')
+    task = asyncio.create_task(run_import(job, path, fmt))
+    import_tasks.add(task)
+    task.add_done_callback(import_tasks.discard)
+    return job.job_id
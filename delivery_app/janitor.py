@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete
+from redis.exceptions import RedisError
+from delivery_app.config import (REFRESH_TOKEN_EXPIRE_DAYS, JANITOR_INTERVAL_SECONDS, JANITOR_BATCH_SIZE,
+                                 JANITOR_BATCH_PAUSE_SECONDS, LOCATION_RETENTION_DAYS)
+from delivery_app.db.database import SessionLocal
+from delivery_app.db.models import RefreshToken, CourierLocation
+from delivery_app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = 'janitor:lock:'
+
+
+class Janitor:
+    def __init__(self):
+        self.tasks = []
+        self.stats = {}
+        self.runners = []
+
+    def register(self, name: str, interval: int = JANITOR_INTERVAL_SECONDS):
+        def decorator(fn):
+            self.tasks.append((name, fn, interval))
+            return fn
+        return decorator
+
+    async def acquire(self, name: str, interval: int):
+        client = get_redis()
+        if client is None:
+            return True
+        try:
+            return await client.set(LOCK_PREFIX + name, 1, nx=True, ex=interval)
+        except RedisError as e:
+            logger.warning('janitor lock for %s failed: %s', name, e)
+            return False
+
+    async def run_once(self, name: str, fn, interval: int):
+        if not await self.acquire(name, interval):
+            return
+        started = time.perf_counter()
+        stats = {'started_at': datetime.utcnow().isoformat(), 'rows_deleted': 0, 'error': None}
+        try:
+            stats['rows_deleted'] = await fn()
+        except Exception as e:
+            logger.exception('janitor task %s failed', name)
+            stats['error'] = str(e)
+        stats['duration_ms'] = (time.perf_counter() - started) * 1000
+        self.stats[name] = stats
+        logger.info('janitor task %s deleted %d rows in %.1f ms', name, stats['rows_deleted'], stats['duration_ms'])
+
+    async def run_forever(self, name: str, fn, interval: int):
+        while True:
+            await self.run_once(name, fn, interval)
+            await asyncio.sleep(interval)
+
+    def start(self):
+        self.runners = [asyncio.create_task(self.run_forever(*task)) for task in self.tasks]
+
+    async def stop(self):
+        for runner in self.runners:
+            runner.cancel()
+        await asyncio.gather(*self.runners, return_exceptions=True)
+        self.runners = []
+
+
+janitor = Janitor()
+
+
+async def delete_in_batches(model, condition, batch_size: int = JANITOR_BATCH_SIZE):
+    deleted = 0
+    while True:
+        ids = select(model.id).where(condition).order_by(model.id).limit(batch_size).scalar_subquery()
+        async with SessionLocal() as db:
+            result = await db.execute(
+                delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
+        await asyncio.sleep(JANITOR_BATCH_PAUSE_SECONDS)
+
+
+@janitor.register('expired_refresh_tokens')
+async def delete_expired_refresh_tokens():
+    cutoff = datetime.utcnow() - timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    return await delete_in_batches(RefreshToken, RefreshToken.created_date < cutoff)
+
+
+@janitor.register('old_courier_locations')
+async def delete_old_courier_locations():
+    cutoff = datetime.utcnow() - timedelta(days=LOCATION_RETENTION_DAYS)
+    return await delete_in_batches(CourierLocation, CourierLocation.recorded_at < cutoff)
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from delivery_app.config import (LOCATION_BUFFER_SIZE, LOCATION_BUFFER_POLICY, LOCATION_FLUSH_SIZE,
+                                 LOCATION_FLUSH_INTERVAL_SECONDS, LOCATION_STOP_TIMEOUT_SECONDS)
+from delivery_app.db.database import engine
+from delivery_app.geo import LOCATION_CHANNEL, move_couriers
+from delivery_app.metrics import LOCATION_PINGS, LOCATION_BUFFERED, LOCATION_FLUSH
+from delivery_app.redis_client import get_redis
+from delivery_app.tracking import registry
+
+logger = logging.getLogger(__name__)
+
+POSITIONS_KEY = 'courier:positions'
+STAGE = 'courier_location_stage'
+COLUMNS = ('courier_id', 'latitude', 'longitude', 'recorded_at')
+
+MERGE_HISTORY = text(
+    f'INSERT INTO courier_location ({", ".join(COLUMNS)}) '
+    f'SELECT s.courier_id, s.latitude, s.longitude, s.recorded_at FROM {STAGE} s '
+    f'WHERE EXISTS (SELECT 1 FROM courier c WHERE c.id = s.courier_id)'
+)
+MERGE_LATEST = text(
+    f'UPDATE courier c SET latitude = l.latitude, longitude = l.longitude, location_updated_at = l.recorded_at '
+    f'FROM (SELECT DISTINCT ON (courier_id) * FROM {STAGE} ORDER BY courier_id, recorded_at DESC) l '
+    f'WHERE c.id = l.courier_id AND (c.location_updated_at IS NULL OR c.location_updated_at < l.recorded_at)'
+)
+
+
+def utc_naive(value):
+    if value is None:
+        return datetime.utcnow()
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class LocationBuffer:
+    def __init__(self, maxsize: int = LOCATION_BUFFER_SIZE, policy: str = LOCATION_BUFFER_POLICY):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.rows = deque()
+        self.ready = asyncio.Event()
+        self.runner = None
+        self.stopping = False
+        self.accepted = 0
+        self.requeued = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.flushed = 0
+        self.flush_errors = 0
+        self.last_flush_ms = 0.0
+
+    def offer(self, rows):
+        free = self.maxsize - len(self.rows)
+        if len(rows) > free:
+            if self.policy == 'reject':
+                self.rejected += len(rows)
+                LOCATION_PINGS.labels('rejected').inc(len(rows))
+                return False
+            overflow = len(rows) - free
+            if len(rows) > self.maxsize:
+                rows = rows[-self.maxsize:]
+            for _ in range(min(overflow, len(self.rows))):
+                self.rows.popleft()
+            self.dropped += overflow
+            LOCATION_PINGS.labels('dropped').inc(overflow)
+        self.rows.extend(rows)
+        self.accepted += len(rows)
+        LOCATION_PINGS.labels('accepted').inc(len(rows))
+        LOCATION_BUFFERED.set(len(self.rows))
+        if len(self.rows) >= LOCATION_FLUSH_SIZE:
+            self.ready.set()
+        return True
+
+    def drain(self, limit: int):
+        batch = [self.rows.popleft() for _ in range(min(limit, len(self.rows)))]
+        LOCATION_BUFFERED.set(len(self.rows))
+        return batch
+
+    def requeue(self, batch):
+        free = max(self.maxsize - len(self.rows), 0)
+        kept = batch[len(batch) - free:] if len(batch) > free else batch
+        lost = len(batch) - len(kept)
+        self.rows.extendleft(reversed(kept))
+        self.requeued += len(kept)
+        if lost:
+            self.dropped += lost
+            LOCATION_PINGS.labels('dropped').inc(lost)
+            logger.warning('location buffer full, dropped %d pings from a failed flush', lost)
+        LOCATION_BUFFERED.set(len(self.rows))
+
+    async def write(self, batch):
+        async with engine.connect() as conn:
+            async with conn.begin():
+                await conn.execute(text(f'CREATE TEMP TABLE {STAGE} (courier_id integer, latitude double precision, '
+                                        f'longitude double precision, recorded_at timestamp) ON COMMIT DROP'))
+                raw = (await conn.get_raw_connection()).driver_connection
+                await raw.copy_records_to_table(STAGE, records=batch, columns=COLUMNS)
+                await conn.execute(MERGE_HISTORY)
+                await conn.execute(MERGE_LATEST)
+
+    async def flush(self):
+        while self.rows:
+            batch = self.drain(LOCATION_FLUSH_SIZE)
+            started = time.perf_counter()
+            try:
+                await self.write(batch)
+            except Exception:
+                logger.exception('location flush of %d rows failed', len(batch))
+                self.flush_errors += 1
+                self.requeue(batch)
+                return
+            elapsed = time.perf_counter() - started
+            LOCATION_FLUSH.observe(elapsed)
+            self.last_flush_ms = elapsed * 1000
+            self.flushed += len(batch)
+
+    async def run_forever(self):
+        while not self.stopping:
+            try:
+                await asyncio.wait_for(self.ready.wait(), LOCATION_FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self.ready.clear()
+            await self.flush()
+        await self.flush()
+
+    def start(self):
+        self.stopping = False
+        self.runner = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        self.stopping = True
+        self.ready.set()
+        if self.runner is None:
+            await self.flush()
+        else:
+            try:
+                await asyncio.wait_for(asyncio.shield(self.runner), LOCATION_STOP_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning('location flush did not finish in %ss', LOCATION_STOP_TIMEOUT_SECONDS)
+                self.runner.cancel()
+                await asyncio.gather(self.runner, return_exceptions=True)
+            self.runner = None
+        if self.rows:
+            self.dropped += len(self.rows)
+            LOCATION_PINGS.labels('dropped').inc(len(self.rows))
+            logger.warning('dropping %d unflushed location pings on shutdown', len(self.rows))
+
+    @property
+    def stats(self):
+        return {
+            'buffered': len(self.rows),
+            'capacity': self.maxsize,
+            'policy': self.policy,
+            'accepted': self.accepted,
+            'dropped': self.dropped,
+            'requeued': self.requeued,
+            'rejected': self.rejected,
+            'flushed': self.flushed,
+            'flush_errors': self.flush_errors,
+            'last_flush_ms': self.last_flush_ms,
+        }
+
+
+location_buffer = LocationBuffer()
+
+
+def latest_positions(rows):
+    latest = {}
+    for courier_id, latitude, longitude, recorded_at in rows:
+        current = latest.get(courier_id)
+        if current is None or current[2] <= recorded_at:
+            latest[courier_id] = (latitude, longitude, recorded_at)
+    return latest
+
+
+async def publish_positions(latest: dict):
+    positions = [(courier_id, lat, lon) for courier_id, (lat, lon, _) in latest.items()]
+    move_couriers(positions)
+    client = get_redis()
+    if client is None:
+        registry.on_positions(positions)
+        return
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hset(POSITIONS_KEY, mapping={
+                courier_id: json.dumps({'lat': lat, 'lon': lon, 'at': recorded_at.isoformat()})
+                for courier_id, (lat, lon, recorded_at) in latest.items()
+            })
+            pipe.publish(LOCATION_CHANNEL, json.dumps({'positions': positions}))
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning('courier position update failed: %s', e)
+
+
+async def ingest(pings):
+    rows = [(p.courier_id, p.latitude, p.longitude, utc_naive(p.recorded_at)) for p in pings]
+    if not rows:
+        return True
+    if not location_buffer.offer(rows):
+        return False
+    await publish_positions(latest_positions(rows))
+    return True
@@ -1,43 +1,65 @@
 import fastapi
 from delivery_app.db.database import engine
 import uvicorn
-from passlib.context import CryptContext
-from fastapi.security import OAuth2PasswordBearer
-import redis.asyncio as redis
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi_limiter import FastAPILimiter
+from fastapi_limiter import FastAPILimiter, http_default_callback
 from sqladmin import Admin
 from delivery_app.admin.setup import setup_admin
-from delivery_app.api.endpionts import auth, category, contact, store, product
+from delivery_app.api.endpionts import (auth, category, contact, store, product, product_combo, courier, order,
+                                        review_store, review_product, search, imports, export, monitoring,
+                                        metrics, profiling, dispatch, tracking)
 from starlette.middleware.sessions import SessionMiddleware
-from delivery_app.config import SECRET_KEY
+from delivery_app.config import SECRET_KEY, PROFILING_ENABLED
+from delivery_app.redis_client import init_redis, close_redis
+from delivery_app.cache import start_invalidation_listener
+from delivery_app.passwords import shutdown_password_pool
+from delivery_app.janitor import janitor
+from delivery_app.geo import load_couriers, start_courier_listener
+from delivery_app.locations import location_buffer
+from delivery_app.tracking import start_tracking_listener
+from delivery_app.middleware import QueryTimingMiddleware, MetricsMiddleware
+from delivery_app.profiling import ProfilingMiddleware
+from delivery_app.metrics import RATE_LIMIT_REJECTIONS, route_template, mark_process_dead
 
 
-async def init_redis():
-    return redis.Redis.from_url(
-        'redis://redis:6379',
-        encoding='utf-8',
-        decode_responses=True
-    )
+async def rate_limit_callback(request, response, pexpire: int):
+    RATE_LIMIT_REJECTIONS.labels(route_template(request.scope)).inc()
+    await http_default_callback(request, response, pexpire)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     redis_conn = await init_redis()
-    await FastAPILimiter.init(redis_conn)
+    await FastAPILimiter.init(redis_conn, http_callback=rate_limit_callback)
+    invalidation_listener = start_invalidation_listener()
+    courier_listener = start_courier_listener()
+    tracking_listener = start_tracking_listener()
+    await load_couriers()
+    janitor.start()
+    location_buffer.start()
     yield
-    await redis_conn.close()
+    await location_buffer.stop()
+    await janitor.stop()
+    invalidation_listener.cancel()
+    courier_listener.cancel()
+    tracking_listener.cancel()
+    await asyncio.gather(invalidation_listener, courier_listener, tracking_listener, return_exceptions=True)
+    await close_redis()
+    shutdown_password_pool()
+    mark_process_dead()
 
 
 delivery = fastapi.FastAPI(title='Delivery', lifespan=lifespan)
 delivery.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
+delivery.add_middleware(QueryTimingMiddleware)
+delivery.add_middleware(MetricsMiddleware)
+if PROFILING_ENABLED:
+    delivery.add_middleware(ProfilingMiddleware)
 
 admin = Admin(delivery, engine)
 
-oauth2_schema = OAuth2PasswordBearer(tokenUrl='/auth/login')
-password_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
-
 setup_admin(delivery)
 
 delivery.include_router(auth.auth_router)
@@ -45,6 +67,19 @@ delivery.include_router(category.category_router)
 delivery.include_router(store.store_router)
 delivery.include_router(contact.contact_router)
 delivery.include_router(product.product_router)
+delivery.include_router(product_combo.product_combo_router)
+delivery.include_router(courier.courier_router)
+delivery.include_router(order.order_router)
+delivery.include_router(dispatch.dispatch_router)
+delivery.include_router(tracking.tracking_router)
+delivery.include_router(review_store.review_store_router)
+delivery.include_router(review_product.review_product_router)
+delivery.include_router(search.search_router)
+delivery.include_router(imports.import_router)
+delivery.include_router(export.export_router)
+delivery.include_router(monitoring.monitoring_router)
+delivery.include_router(metrics.metrics_router)
+delivery.include_router(profiling.profiling_router)
 
 
 if __name__ == "__main__":
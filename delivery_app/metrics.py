@@ -0,0 +1,57 @@
+import os
+from prometheus_client import (CollectorRegistry, Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, REGISTRY,
+                               generate_latest, multiprocess)
+from delivery_app.config import PROMETHEUS_MULTIPROC_DIR
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP request latency',
+                            ['method', 'route', 'status'], buckets=LATENCY_BUCKETS)
+REQUESTS_IN_PROGRESS = Gauge('http_requests_in_progress', 'HTTP requests being served',
+                             ['method'], multiprocess_mode='livesum')
+RESPONSE_SIZE = Histogram('http_response_size_bytes', 'HTTP response body size',
+                          ['method', 'route'], buckets=SIZE_BUCKETS)
+
+DB_POOL_CHECKED_OUT = Gauge('db_pool_checked_out', 'Connections checked out of the pool',
+                            multiprocess_mode='livesum')
+DB_POOL_OVERFLOW = Gauge('db_pool_overflow', 'Overflow connections currently open',
+                         multiprocess_mode='livesum')
+DB_POOL_WAIT = Histogram('db_pool_checkout_wait_seconds', 'Time spent waiting for a pool connection',
+                         buckets=FAST_BUCKETS)
+
+REDIS_LATENCY = Histogram('redis_command_duration_seconds', 'Redis command latency',
+                          ['command'], buckets=FAST_BUCKETS)
+REDIS_ERRORS = Counter('redis_command_errors_total', 'Redis commands that raised', ['command'])
+
+LOCATION_PINGS = Counter('courier_location_pings_total', 'Courier location pings by outcome', ['result'])
+LOCATION_BUFFERED = Gauge('courier_location_buffered', 'Location pings waiting to be flushed',
+                          multiprocess_mode='livesum')
+LOCATION_FLUSH = Histogram('courier_location_flush_seconds', 'Time spent writing a location batch',
+                           buckets=LATENCY_BUCKETS)
+
+TRACKING_CONNECTIONS = Gauge('order_tracking_connections', 'Open order tracking connections', ['transport'],
+                             multiprocess_mode='livesum')
+TRACKING_DROPPED = Counter('order_tracking_dropped_total', 'Tracking messages dropped for slow clients')
+
+RATE_LIMIT_REJECTIONS = Counter('rate_limit_rejections_total', 'Requests rejected by the rate limiter', ['route'])
+
+
+def route_template(scope):
+    route = scope.get('route')
+    return route.path if route is not None else 'unmatched'
+
+
+def render():
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
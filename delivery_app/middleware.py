@@ -0,0 +1,65 @@
+import time
+from delivery_app.config import SERVER_TIMING
+from delivery_app.db.pool import track_request
+from delivery_app.db.query_stats import endpoint_stats, track_queries
+from delivery_app.metrics import REQUEST_LATENCY, REQUESTS_IN_PROGRESS, RESPONSE_SIZE, route_template
+
+
+class QueryTimingMiddleware:
+    def __init__(self, app, server_timing: bool = SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        stats = track_queries()
+        pool_wait = track_request()
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start' and self.server_timing:
+                app_ms = (time.perf_counter() - started) * 1000
+                value = (f'db;dur={stats.total * 1000:.1f};desc="{stats.count} queries", '
+                         f'db-pool;dur={pool_wait["wait"] * 1000:.1f};desc="{pool_wait["checkouts"]} checkouts", '
+                         f'app;dur={app_ms:.1f}')
+                message['headers'] = [*message.get('headers', []), (b'server-timing', value.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            endpoint_stats.observe(route_template(scope), stats, time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        method = scope['method']
+        status = 500
+        size = 0
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_template(scope)
+            REQUEST_LATENCY.labels(method, route, str(status)).observe(time.perf_counter() - started)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+            in_progress.dec()
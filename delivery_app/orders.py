@@ -0,0 +1,50 @@
+from decimal import Decimal
+from fastapi import HTTPException
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from delivery_app.db.models import Order, OrderItem, Product, ProductCombo
+from delivery_app.db.schema import OrderCreateSchema
+
+
+async def load_prices(db: AsyncSession, model, title, ids):
+    if not ids:
+        return {}
+    result = await db.execute(select(model.id, title, model.price).where(model.id.in_(ids)))
+    return {row[0]: (row[1], row[2]) for row in result}
+
+
+async def place_order(db: AsyncSession, client_id: int, order: OrderCreateSchema):
+    product_ids = {item.product_id for item in order.items if item.product_id is not None}
+    combo_ids = {item.product_combo_id for item in order.items if item.product_combo_id is not None}
+    products = await load_prices(db, Product, Product.product_name, product_ids)
+    combos = await load_prices(db, ProductCombo, ProductCombo.combo_name, combo_ids)
+
+    missing = {'product_id': sorted(product_ids - products.keys()),
+               'product_combo_id': sorted(combo_ids - combos.keys())}
+    if missing['product_id'] or missing['product_combo_id']:
+        raise HTTPException(status_code=400, detail={'missing': missing})
+
+    rows = []
+    total = Decimal(0)
+    for item in order.items:
+        if item.product_id is not None:
+            title, price = products[item.product_id]
+        else:
+            title, price = combos[item.product_combo_id]
+        rows.append({'product_id': item.product_id, 'product_combo_id': item.product_combo_id,
+                     'title': title, 'unit_price': price, 'quantity': item.quantity})
+        total += price * item.quantity
+
+    result = await db.execute(
+        insert(Order)
+        .values(delivery_address=order.delivery_address, client_id=client_id, total_price=total)
+        .returning(Order)
+    )
+    order_db = result.scalars().one()
+    for row in rows:
+        row['order_id'] = order_db.id
+    result = await db.scalars(insert(OrderItem).returning(OrderItem, sort_by_parameter_order=True), rows)
+    set_committed_value(order_db, 'items', result.all())
+    await db.commit()
+    return order_db
@@ -0,0 +1,42 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from delivery_app.config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE
+
+password_context = CryptContext(schemes=['bcrypt'], deprecated='auto', bcrypt__rounds=BCRYPT_ROUNDS)
+
+executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix='bcrypt')
+pending = 0
+
+
+async def run_in_pool(fn, *args):
+    global pending
+    if pending >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE:
+        raise HTTPException(status_code=503, detail='Password hashing is busy, try again later',
+                            headers={'Retry-After': '1'})
+    pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+    finally:
+        pending -= 1
+
+
+def verify_and_upgrade(plain_password: str, hash_password: str):
+    if not password_context.verify(plain_password, hash_password):
+        return False, None
+    if password_context.needs_update(hash_password):
+        return True, password_context.hash(plain_password)
+    return True, None
+
+
+async def get_password_hash(password: str):
+    return await run_in_pool(password_context.hash, password)
+
+
+async def verify_password(plain_password: str, hash_password: str):
+    return await run_in_pool(verify_and_upgrade, plain_password, hash_password)
+
+
+def shutdown_password_pool():
+    executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,120 @@
+import hmac
+import random
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from fastapi import Depends, HTTPException
+from delivery_app.config import (PROFILING_ENABLED, PROFILING_TOKEN, PROFILING_ADMINS, PROFILING_SAMPLE_RATE,
+                                 PROFILING_INTERVAL, PROFILING_BUFFER_SIZE)
+from delivery_app.db.schema import CurrentUserSchema
+from delivery_app.metrics import route_template
+from delivery_app.security import get_current_user, decode_token
+
+PROFILE_HEADER = 'x-profile-token'
+
+profiles = deque(maxlen=PROFILING_BUFFER_SIZE)
+
+
+def token_valid(token):
+    return bool(PROFILING_TOKEN) and token is not None and hmac.compare_digest(token, PROFILING_TOKEN)
+
+
+def is_profiling_admin(username):
+    return username in PROFILING_ADMINS
+
+
+def require_profiling_admin(current_user: CurrentUserSchema = Depends(get_current_user)):
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail='Profiling is disabled')
+    if not is_profiling_admin(current_user.username):
+        raise HTTPException(status_code=403, detail='Profiling is restricted to admins')
+
+
+def bearer_admin(authorization):
+    scheme, _, token = (authorization or '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return False
+    try:
+        return is_profiling_admin(decode_token(token).get('sub'))
+    except HTTPException:
+        return False
+
+
+def find_profile(profile_id: str):
+    for profile in profiles:
+        if profile['id'] == profile_id:
+            return profile
+    return None
+
+
+def profile_summary(profile):
+    return {key: value for key, value in profile.items() if key != 'session'}
+
+
+def render_profile(profile, fmt: str):
+    from pyinstrument.renderers import ConsoleRenderer, HTMLRenderer, SpeedscopeRenderer
+
+    if fmt == 'speedscope':
+        return SpeedscopeRenderer().render(profile['session']), 'application/json'
+    if fmt == 'html':
+        return HTMLRenderer().render(profile['session']), 'text/html'
+    return ConsoleRenderer(unicode=True, color=False, show_all=False).render(profile['session']), 'text/plain'
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        from pyinstrument import Profiler
+
+        self.app = app
+        self.profiler_class = Profiler
+
+    # The on-demand trigger is off unless PROFILING_TOKEN is set, and it needs both that token and an access
+    # token of a PROFILING_ADMINS user; sampling works without either.
+    def trigger(self, scope):
+        if PROFILING_TOKEN:
+            headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']
+                       if name in (PROFILE_HEADER.encode(), b'authorization')}
+            if token_valid(headers.get(PROFILE_HEADER)) and bearer_admin(headers.get('authorization')):
+                return 'header'
+        if PROFILING_SAMPLE_RATE and random.random() < PROFILING_SAMPLE_RATE:
+            return 'sample'
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        trigger = self.trigger(scope)
+        if trigger is None:
+            return await self.app(scope, receive, send)
+
+        profile_id = uuid.uuid4().hex
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if trigger == 'header':
+                    message['headers'] = [*message.get('headers', []), (b'x-profile-id', profile_id.encode())]
+            await send(message)
+
+        profiler = self.profiler_class(interval=PROFILING_INTERVAL, async_mode='enabled')
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session = profiler.stop()
+            profiles.append({
+                'id': profile_id,
+                'trigger': trigger,
+                'method': scope['method'],
+                'path': scope['path'],
+                'route': route_template(scope),
+                'status': status,
+                'duration_ms': (time.perf_counter() - started) * 1000,
+                'started_at': started_at.isoformat(),
+                'session': session,
+            })
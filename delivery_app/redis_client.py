@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+import redis.asyncio as redis
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+from delivery_app.config import REDIS_URL
+from delivery_app.metrics import REDIS_LATENCY, REDIS_ERRORS
+
+logger = logging.getLogger(__name__)
+
+LISTEN_RETRY_SECONDS = 1
+redis_conn: Optional[redis.Redis] = None
+
+
+class InstrumentedRedis(redis.Redis):
+    async def execute_command(self, *args, **options):
+        command = str(args[0]).upper()
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        except RedisError:
+            REDIS_ERRORS.labels(command).inc()
+            raise
+        finally:
+            REDIS_LATENCY.labels(command).observe(time.perf_counter() - started)
+
+
+async def init_redis():
+    global redis_conn
+    redis_conn = InstrumentedRedis.from_url(
+        REDIS_URL,
+        encoding='utf-8',
+        decode_responses=True
+    )
+    return redis_conn
+
+
+async def close_redis():
+    global redis_conn
+    if redis_conn is not None:
+        await redis_conn.close()
+        redis_conn = None
+
+
+def get_redis() -> Optional[redis.Redis]:
+    return redis_conn
+
+
+def redis_or_503() -> redis.Redis:
+    if redis_conn is None:
+        raise HTTPException(status_code=503, detail='Redis is unavailable')
+    return redis_conn
+
+
+async def listen(channels, handler):
+    while redis_conn is not None:
+        pubsub = redis_conn.pubsub()
+        try:
+            await pubsub.subscribe(*channels)
+            async for message in pubsub.listen():
+                if message['type'] != 'message':
+                    continue
+                try:
+                    await handler(message['channel'], message['data'])
+                except Exception:
+                    logger.exception('pubsub handler for %s failed', message['channel'])
+        except RedisError as e:
+            logger.warning('pubsub listener for %s failed: %s', channels, e)
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+        finally:
+            await pubsub.aclose()
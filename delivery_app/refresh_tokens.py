@@ -0,0 +1,115 @@
+import asyncio
+import hashlib
+import logging
+import uuid
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import select, delete
+from delivery_app.config import REFRESH_TOKEN_EXPIRE_DAYS, REFRESH_TOKEN_AUDIT
+from delivery_app.db.database import SessionLocal
+from delivery_app.db.models import RefreshToken
+from delivery_app.redis_client import redis_or_503, init_redis, close_redis
+from delivery_app.security import create_refresh_token, decode_token
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PREFIX = 'refresh:token:'
+USER_PREFIX = 'refresh:user:'
+TOKEN_TTL_SECONDS = REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+DRAIN_BATCH_SIZE = 1000
+
+invalid_token_exception = HTTPException(status_code=401, detail='маалымат туура эмес')
+audit_tasks = set()
+
+
+def token_key(token: str):
+    return TOKEN_PREFIX + hashlib.sha256(token.encode()).hexdigest()
+
+
+async def store_token(client, token: str, user_id: int, ttl: int):
+    key = token_key(token)
+    user_key = USER_PREFIX + str(user_id)
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.set(key, user_id, ex=ttl)
+        pipe.sadd(user_key, key)
+        pipe.expire(user_key, TOKEN_TTL_SECONDS)
+        await pipe.execute()
+
+
+async def write_audit(token: str, user_id: int):
+    try:
+        async with SessionLocal() as db:
+            db.add(RefreshToken(token=token, user_id=user_id))
+            await db.commit()
+    except Exception:
+        logger.exception('refresh token audit write failed')
+
+
+async def issue_refresh_token(user_id: int, username: str):
+    token = create_refresh_token({'sub': username, 'user_id': user_id, 'jti': uuid.uuid4().hex})
+    await store_token(redis_or_503(), token, user_id, TOKEN_TTL_SECONDS)
+    if REFRESH_TOKEN_AUDIT:
+        task = asyncio.create_task(write_audit(token, user_id))
+        audit_tasks.add(task)
+        task.add_done_callback(audit_tasks.discard)
+    return token
+
+
+async def revoke_refresh_token(token: str):
+    decode_token(token, 'refresh')
+    client = redis_or_503()
+    key = token_key(token)
+    user_id = await client.getdel(key)
+    if user_id is None:
+        raise invalid_token_exception
+    await client.srem(USER_PREFIX + user_id, key)
+    return int(user_id)
+
+
+async def rotate_refresh_token(token: str):
+    claims = decode_token(token, 'refresh')
+    user_id = await revoke_refresh_token(token)
+    return user_id, claims['sub'], await issue_refresh_token(user_id, claims['sub'])
+
+
+async def revoke_all_refresh_tokens(user_id: int):
+    client = redis_or_503()
+    user_key = USER_PREFIX + str(user_id)
+    keys = await client.smembers(user_key)
+    await client.delete(user_key, *keys)
+    return len(keys)
+
+
+async def drain_legacy_tokens():
+    client = redis_or_503()
+    drained = 0
+    last_id = 0
+    while True:
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(RefreshToken).where(RefreshToken.id > last_id).order_by(RefreshToken.id).limit(DRAIN_BATCH_SIZE)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                return drained
+            now = datetime.utcnow()
+            for row in rows:
+                ttl = int((row.created_date + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS) - now).total_seconds())
+                if ttl > 0:
+                    await store_token(client, row.token, row.user_id, ttl)
+            last_id = rows[-1].id
+            await db.execute(delete(RefreshToken).where(RefreshToken.id <= last_id))
+            await db.commit()
+            drained += len(rows)
+
+
+async def main():
+    await init_redis()
+    try:
+        print(f'drained {await drain_legacy_tokens()} refresh tokens')
+    finally:
+        await close_redis()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
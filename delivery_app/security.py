@@ -0,0 +1,73 @@
+import time
+from datetime import timedelta, datetime
+from typing import Optional
+from fastapi import Depends, HTTPException
+from fastapi.security import OAuth2PasswordBearer
+from jose import jwt, JWTError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from delivery_app.config import (SECRET_KEY, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS, ALGORITHM,
+                                 AUTH_CACHE_SIZE, AUTH_CLAIMS_CACHE_TTL_SECONDS, AUTH_USER_CACHE_TTL_SECONDS)
+from delivery_app.db.database import get_db
+from delivery_app.db.models import UserProfile
+from delivery_app.db.schema import CurrentUserSchema
+from delivery_app.local_cache import LRUCache
+
+oauth2_schema = OAuth2PasswordBearer(tokenUrl='/auth/login')
+
+claims_cache = LRUCache(AUTH_CACHE_SIZE, AUTH_CLAIMS_CACHE_TTL_SECONDS)
+user_cache = LRUCache(AUTH_CACHE_SIZE, AUTH_USER_CACHE_TTL_SECONDS)
+
+credentials_exception = HTTPException(status_code=401, detail='Could not validate credentials',
+                                      headers={'WWW-Authenticate': 'Bearer'})
+
+
+def encode_token(data: dict, token_type: str, expires_delta: timedelta):
+    to_encode = data.copy()
+    to_encode.update({'exp': datetime.utcnow() + expires_delta, 'type': token_type})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    return encode_token(data, 'access', expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+
+
+def create_refresh_token(data: dict):
+    return encode_token(data, 'refresh', timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+
+
+def decode_token(token: str, token_type: str = 'access'):
+    claims = claims_cache.get(token)
+    if claims is None:
+        try:
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            raise credentials_exception
+        ttl = min(AUTH_CLAIMS_CACHE_TTL_SECONDS, claims['exp'] - time.time())
+        if ttl > 0:
+            claims_cache.set(token, claims, ttl)
+    if claims.get('type') != token_type:
+        raise credentials_exception
+    return claims
+
+
+def invalidate_user(user_id: int):
+    user_cache.pop(user_id)
+
+
+async def get_current_user(token: str = Depends(oauth2_schema), db: AsyncSession = Depends(get_db)):
+    user_id = decode_token(token).get('user_id')
+    if user_id is None:
+        raise credentials_exception
+
+    user = user_cache.get(user_id)
+    if user is None:
+        result = await db.execute(
+            select(UserProfile.id, UserProfile.username, UserProfile.status).where(UserProfile.id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            raise credentials_exception
+        user = CurrentUserSchema(id=row.id, username=row.username, status=row.status)
+        user_cache.set(user_id, user)
+    return user
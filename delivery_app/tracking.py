@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+from redis.exceptions import RedisError
+from delivery_app.config import TRACKING_QUEUE_SIZE, TRACKING_MAX_DROPS, TRACKING_HEARTBEAT_SECONDS
+from delivery_app.geo import LOCATION_CHANNEL
+from delivery_app.metrics import TRACKING_CONNECTIONS, TRACKING_DROPPED
+from delivery_app.redis_client import get_redis, listen
+
+logger = logging.getLogger(__name__)
+
+ORDER_CHANNEL = 'order:events'
+HEARTBEAT = {'type': 'ping'}
+
+
+class Connection:
+    def __init__(self, order_id: int, transport: str, queue_size: int = TRACKING_QUEUE_SIZE):
+        self.order_id = order_id
+        self.transport = transport
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.slow = False
+        self.closed = asyncio.Event()
+
+    async def next_message(self):
+        getter = asyncio.ensure_future(self.queue.get())
+        closer = asyncio.ensure_future(self.closed.wait())
+        await asyncio.wait({getter, closer}, timeout=TRACKING_HEARTBEAT_SECONDS,
+                           return_when=asyncio.FIRST_COMPLETED)
+        closer.cancel()
+        if getter.done():
+            return getter.result()
+        getter.cancel()
+        if self.closed.is_set():
+            return None
+        return HEARTBEAT
+
+    def push(self, message: dict):
+        if self.closed.is_set():
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            TRACKING_DROPPED.inc()
+            if self.dropped >= TRACKING_MAX_DROPS:
+                self.slow = True
+                self.closed.set()
+                return
+        self.queue.put_nowait(message)
+
+
+class TrackingRegistry:
+    def __init__(self):
+        self.orders = {}
+        self.order_couriers = {}
+        self.courier_orders = {}
+
+    def register(self, order_id: int, transport: str, courier_id=None):
+        connection = Connection(order_id, transport)
+        self.orders.setdefault(order_id, set()).add(connection)
+        self.assign(order_id, courier_id)
+        TRACKING_CONNECTIONS.labels(transport).inc()
+        return connection
+
+    def unregister(self, connection: Connection):
+        connection.closed.set()
+        connections = self.orders.get(connection.order_id)
+        if connections is None or connection not in connections:
+            return
+        connections.discard(connection)
+        TRACKING_CONNECTIONS.labels(connection.transport).dec()
+        if not connections:
+            del self.orders[connection.order_id]
+            self.assign(connection.order_id, None)
+
+    def assign(self, order_id: int, courier_id):
+        previous = self.order_couriers.pop(order_id, None)
+        if previous is not None:
+            orders = self.courier_orders.get(previous)
+            if orders is not None:
+                orders.discard(order_id)
+                if not orders:
+                    del self.courier_orders[previous]
+        if courier_id is not None and order_id in self.orders:
+            self.order_couriers[order_id] = courier_id
+            self.courier_orders.setdefault(courier_id, set()).add(order_id)
+
+    def send(self, order_id: int, message: dict):
+        for connection in tuple(self.orders.get(order_id, ())):
+            connection.push(message)
+
+    def on_order_event(self, event: dict):
+        order_id = event['order_id']
+        if order_id not in self.orders:
+            return
+        self.assign(order_id, event.get('courier_id'))
+        self.send(order_id, event)
+
+    def on_positions(self, positions):
+        for courier_id, latitude, longitude in positions:
+            for order_id in tuple(self.courier_orders.get(courier_id, ())):
+                self.send(order_id, {'type': 'position', 'order_id': order_id, 'courier_id': courier_id,
+                                     'lat': latitude, 'lon': longitude})
+
+    @property
+    def stats(self):
+        connections = [c for group in self.orders.values() for c in group]
+        return {
+            'orders': len(self.orders),
+            'connections': len(connections),
+            'queued': sum(c.queue.qsize() for c in connections),
+            'dropped': sum(c.dropped for c in connections),
+        }
+
+
+registry = TrackingRegistry()
+
+
+def order_event(order):
+    return {'type': 'status', 'order_id': order.id, 'status': order.status.value, 'version': order.version,
+            'courier_id': order.courier_id}
+
+
+async def publish_order(order):
+    event = order_event(order)
+    client = get_redis()
+    if client is not None:
+        try:
+            await client.publish(ORDER_CHANNEL, json.dumps(event))
+            return
+        except RedisError as e:
+            logger.warning('order event publish failed for %s: %s', order.id, e)
+    registry.on_order_event(event)
+
+
+async def on_tracking_message(channel: str, data: str):
+    event = json.loads(data)
+    if channel == ORDER_CHANNEL:
+        registry.on_order_event(event)
+    elif 'positions' in event:
+        registry.on_positions(event['positions'])
+
+
+def start_tracking_listener():
+    return asyncio.create_task(listen([ORDER_CHANNEL, LOCATION_CHANNEL], on_tracking_message))
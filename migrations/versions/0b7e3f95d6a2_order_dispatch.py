@@ -0,0 +1,39 @@
+"""order dispatch
+
+Revision ID: 0b7e3f95d6a2
+Revises: f2d84c1a7b35
+Create Date: 2026-10-18 15:24:09.731542
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e3f95d6a2'
+down_revision: Union[str, None] = 'f2d84c1a7b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('order', sa.Column('version', sa.Integer(), nullable=False, server_default=sa.text('1')))
+    op.add_column('order', sa.Column('courier_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('order_courier_id_fkey', 'order', 'courier', ['courier_id'], ['id'], ondelete='SET NULL')
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_order_courier_id'), 'order', ['courier_id'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index('ix_order_awaiting_dispatch', 'order', ['created_date', 'id'], unique=False,
+                        postgresql_where=sa.text("status = 'awaiting_processing' AND courier_id IS NULL"),
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_order_awaiting_dispatch', table_name='order', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_order_courier_id'), table_name='order', postgresql_concurrently=True)
+    op.drop_constraint('order_courier_id_fkey', 'order', type_='foreignkey')
+    op.drop_column('order', 'courier_id')
+    op.drop_column('order', 'version')
@@ -0,0 +1,34 @@
+"""store and courier coordinates
+
+Revision ID: 3c5a9e7f1d48
+Revises: 0b7e3f95d6a2
+Create Date: 2026-10-18 16:02:44.186203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5a9e7f1d48'
+down_revision: Union[str, None] = '0b7e3f95d6a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('store', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('store', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('courier', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('courier', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('courier', sa.Column('location_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('courier', 'location_updated_at')
+    op.drop_column('courier', 'longitude')
+    op.drop_column('courier', 'latitude')
+    op.drop_column('store', 'longitude')
+    op.drop_column('store', 'latitude')
@@ -0,0 +1,35 @@
+"""search trigram indexes
+
+Revision ID: 5d2e8b1f7c3a
+Revises: 49ca3df0e20d
+Create Date: 2026-10-18 10:05:12.418093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8b1f7c3a'
+down_revision: Union[str, None] = '49ca3df0e20d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRGM_INDEXES = [
+    ('ix_store_store_name_trgm', 'store', 'store_name'),
+    ('ix_store_description_trgm', 'store', 'description'),
+    ('ix_product_product_name_trgm', 'product', 'product_name'),
+    ('ix_product_combo_combo_name_trgm', 'product_combo', 'combo_name'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRGM_INDEXES:
+        op.create_index(name, table, [column], postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    for name, table, column in TRGM_INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,39 @@
+"""courier location history
+
+Revision ID: 7d1f4b2e8c93
+Revises: 3c5a9e7f1d48
+Create Date: 2026-10-18 16:47:30.552871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d1f4b2e8c93'
+down_revision: Union[str, None] = '3c5a9e7f1d48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('courier_location',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('courier_id', sa.Integer(), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['courier_id'], ['courier.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_courier_location_courier_id_recorded_at', 'courier_location', ['courier_id', 'recorded_at'],
+                    unique=False)
+    op.create_index(op.f('ix_courier_location_recorded_at'), 'courier_location', ['recorded_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_courier_location_recorded_at'), table_name='courier_location')
+    op.drop_index('ix_courier_location_courier_id_recorded_at', table_name='courier_location')
+    op.drop_table('courier_location')
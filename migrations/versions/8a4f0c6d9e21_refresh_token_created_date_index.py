@@ -0,0 +1,29 @@
+"""refresh token created_date index
+
+Revision ID: 8a4f0c6d9e21
+Revises: 5d2e8b1f7c3a
+Create Date: 2026-10-18 11:42:37.905114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4f0c6d9e21'
+down_revision: Union[str, None] = '5d2e8b1f7c3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_refresh_token_created_date'), 'refresh_token', ['created_date'], unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_refresh_token_created_date'), table_name='refresh_token',
+                      postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""order items
+
+Revision ID: a4e2c8d6f913
+Revises: 7d1f4b2e8c93
+Create Date: 2026-10-18 17:31:05.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e2c8d6f913'
+down_revision: Union[str, None] = '7d1f4b2e8c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('order', sa.Column('total_price', sa.DECIMAL(precision=10, scale=2), nullable=False,
+                                     server_default=sa.text('0')))
+    op.create_table('order_item',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=True),
+    sa.Column('product_combo_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(length=64), nullable=False),
+    sa.Column('unit_price', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['order.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['product_combo_id'], ['product_combo.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_order_item_order_id'), 'order_item', ['order_id'], unique=False)
+    op.create_index(op.f('ix_order_item_product_id'), 'order_item', ['product_id'], unique=False)
+    op.create_index(op.f('ix_order_item_product_combo_id'), 'order_item', ['product_combo_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_order_item_product_combo_id'), table_name='order_item')
+    op.drop_index(op.f('ix_order_item_product_id'), table_name='order_item')
+    op.drop_index(op.f('ix_order_item_order_id'), table_name='order_item')
+    op.drop_table('order_item')
+    op.drop_column('order', 'total_price')
@@ -0,0 +1,27 @@
+"""order created_date
+
+Revision ID: c37e5a9b1d08
+Revises: 8a4f0c6d9e21
+Create Date: 2026-10-18 13:20:51.227460
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c37e5a9b1d08'
+down_revision: Union[str, None] = '8a4f0c6d9e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('order', sa.Column('created_date', sa.DateTime(), nullable=False,
+                                     server_default=sa.text("timezone('utc', now())")))
+
+
+def downgrade() -> None:
+    op.drop_column('order', 'created_date')
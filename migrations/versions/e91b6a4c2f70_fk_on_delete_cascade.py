@@ -0,0 +1,54 @@
+"""fk on delete cascade
+
+Revision ID: e91b6a4c2f70
+Revises: c37e5a9b1d08
+Create Date: 2026-10-18 14:05:12.603118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b6a4c2f70'
+down_revision: Union[str, None] = 'c37e5a9b1d08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FOREIGN_KEYS = [
+    ('refresh_token', 'user_id', 'user_profile'),
+    ('store', 'category_id', 'category'),
+    ('store', 'owner_id', 'user_profile'),
+    ('contact', 'store_id', 'store'),
+    ('product', 'store_id', 'store'),
+    ('product_combo', 'store_id', 'store'),
+    ('product_combo', 'category_id', 'category'),
+    ('courier', 'courier_id', 'user_profile'),
+    ('courier', 'product_current_orders_id', 'product'),
+    ('courier', 'combo_current_orders_id', 'product_combo'),
+    ('order', 'client_id', 'user_profile'),
+    ('review_store', 'user_name_id', 'user_profile'),
+    ('review_store', 'store_id', 'store'),
+    ('review_product', 'user_name_id', 'user_profile'),
+    ('review_product', 'product_id', 'product'),
+]
+
+
+def recreate(ondelete):
+    for table, column, referent in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referent, [column], ['id'], ondelete=ondelete, postgresql_not_valid=True)
+    with op.get_context().autocommit_block():
+        for table, column, _ in FOREIGN_KEYS:
+            op.execute(f'ALTER TABLE "{table}" VALIDATE CONSTRAINT {table}_{column}_fkey')
+
+
+def upgrade() -> None:
+    recreate('CASCADE')
+
+
+def downgrade() -> None:
+    recreate(None)
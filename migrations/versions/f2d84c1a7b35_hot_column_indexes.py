@@ -0,0 +1,53 @@
+"""hot column indexes
+
+Revision ID: f2d84c1a7b35
+Revises: e91b6a4c2f70
+Create Date: 2026-10-18 14:38:26.418907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d84c1a7b35'
+down_revision: Union[str, None] = 'e91b6a4c2f70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_refresh_token_user_id', 'refresh_token', ['user_id']),
+    ('ix_store_category_id', 'store', ['category_id']),
+    ('ix_store_owner_id', 'store', ['owner_id']),
+    ('ix_contact_store_id', 'contact', ['store_id']),
+    ('ix_product_store_id_price', 'product', ['store_id', 'price']),
+    ('ix_product_price_id', 'product', ['price', 'id']),
+    ('ix_product_combo_store_id', 'product_combo', ['store_id']),
+    ('ix_product_combo_category_id', 'product_combo', ['category_id']),
+    ('ix_courier_courier_id', 'courier', ['courier_id']),
+    ('ix_courier_product_current_orders_id', 'courier', ['product_current_orders_id']),
+    ('ix_courier_combo_current_orders_id', 'courier', ['combo_current_orders_id']),
+    ('ix_courier_status_choices', 'courier', ['status_choices']),
+    ('ix_order_client_id_created_date', 'order', ['client_id', 'created_date']),
+    ('ix_order_status_created_date', 'order', ['status', 'created_date']),
+    ('ix_order_created_date', 'order', ['created_date']),
+    ('ix_review_store_user_name_id', 'review_store', ['user_name_id']),
+    ('ix_review_store_store_id', 'review_store', ['store_id']),
+    ('ix_review_product_user_name_id', 'review_product', ['user_name_id']),
+    ('ix_review_product_product_id', 'review_product', ['product_id']),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True,
+                            if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+import pytest
+
+DETAILS = [
+    ('/courier/101', SimpleNamespace(id=101, courier_id=7, product_current_orders_id=1, combo_current_orders_id=1,
+                                     status_choices='available')),
+    ('/order/102', SimpleNamespace(id=102, status='awaiting_processing', delivery_address='Bishkek', client_id=3,
+                                   courier_id=None, version=1)),
+    ('/product_combo/103', SimpleNamespace(id=103, combo_name='Lunch', description='Plov and salad',
+                                           combo_image='lunch.png', price=450.0, store_id=1, category_id=2)),
+    ('/review_product/104', SimpleNamespace(id=104, user_name_id=3, product_id=5)),
+    ('/review_store/105', SimpleNamespace(id=105, user_name_id=3, store_id=1)),
+]
+
+
+@pytest.mark.parametrize('path, row', DETAILS)
+def test_detail_returns_single_object(client, db, path, row):
+    db.results.append(row)
+
+    response = client.get(path)
+    assert response.status_code == 200
+    body = response.json()
+    assert isinstance(body, dict)
+    assert body['id'] == row.id
+
+
+@pytest.mark.parametrize('path', ['/courier/201', '/order/202', '/product_combo/203', '/review_product/204',
+                                  '/review_store/205'])
+def test_detail_missing_row(client, db, path):
+    response = client.get(path)
+    assert response.status_code == 400
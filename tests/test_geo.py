@@ -0,0 +1,62 @@
+import pytest
+from delivery_app import geo
+from delivery_app.geo import apply_courier, available_couriers, courier_index, load_couriers, move_couriers
+
+
+class FakeRows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeCourierSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, *args, **kwargs):
+        return FakeRows(self.rows)
+
+
+@pytest.fixture(autouse=True)
+def clear_index():
+    courier_index.clear()
+    available_couriers.clear()
+    yield
+    courier_index.clear()
+    available_couriers.clear()
+
+
+@pytest.mark.asyncio
+async def test_available_courier_without_coordinates_matches_after_one_ping(monkeypatch):
+    monkeypatch.setattr(geo, 'SessionLocal', lambda: FakeCourierSession([(1, None, None), (2, 42.87, 74.59)]))
+    await load_couriers()
+    assert 1 not in courier_index
+
+    move_couriers([(1, 42.8746, 74.5698)])
+
+    assert [courier_id for courier_id, _ in courier_index.nearest(42.8746, 74.5698, 1)] == [1]
+
+
+def test_ping_does_not_index_unavailable_courier():
+    apply_courier(3, None, None, False)
+
+    move_couriers([(3, 42.8746, 74.5698)])
+
+    assert 3 not in courier_index
+
+
+def test_courier_leaves_index_when_no_longer_available():
+    apply_courier(4, 42.8746, 74.5698, True)
+    apply_courier(4, 42.8746, 74.5698, False)
+
+    move_couriers([(4, 42.8746, 74.5698)])
+
+    assert 4 not in courier_index
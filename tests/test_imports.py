@@ -0,0 +1,27 @@
+from delivery_app.api.endpionts import imports
+
+
+def test_oversized_import_is_rejected(client, monkeypatch):
+    started = []
+
+    async def start_import(*args):
+        started.append(args)
+        return 'job'
+
+    monkeypatch.setattr(imports, 'IMPORT_MAX_BYTES', 16)
+    monkeypatch.setattr(imports, 'start_import', start_import)
+
+    response = client.post('/import/product', content=b'id,product_name\n' * 4, headers={'content-type': 'text/csv'})
+    assert response.status_code == 413
+    assert started == []
+
+
+def test_import_within_limit_is_accepted(client, monkeypatch):
+    async def start_import(*args):
+        return 'job'
+
+    monkeypatch.setattr(imports, 'start_import', start_import)
+
+    response = client.post('/import/product', content=b'id,product_name\n', headers={'content-type': 'text/csv'})
+    assert response.status_code == 202
+    assert response.json() == {'job_id': 'job', 'status': 'pending'}
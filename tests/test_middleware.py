@@ -0,0 +1,40 @@
+import pytest
+from delivery_app.db.pool import pool_stats
+from delivery_app.middleware import QueryTimingMiddleware
+
+
+async def checkout_app(scope, receive, send):
+    pool_stats.observe_wait(0.025)
+    pool_stats.observe_wait(0.015)
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b'ok'})
+
+
+async def call(app):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': '/', 'headers': []}
+    await app(scope, receive, send)
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_server_timing_reports_pool_wait():
+    messages = await call(QueryTimingMiddleware(checkout_app, server_timing=True))
+
+    headers = dict(messages[0]['headers'])
+    assert 'db-pool;dur=40.0;desc="2 checkouts"' in headers[b'server-timing'].decode()
+
+
+@pytest.mark.asyncio
+async def test_pool_wait_is_per_request():
+    await call(QueryTimingMiddleware(checkout_app, server_timing=True))
+    messages = await call(QueryTimingMiddleware(checkout_app, server_timing=True))
+
+    assert 'db-pool;dur=40.0' in dict(messages[0]['headers'])[b'server-timing'].decode()
@@ -0,0 +1,50 @@
+import pytest
+from delivery_app import profiling
+from delivery_app.profiling import ProfilingMiddleware
+from delivery_app.security import create_access_token, create_refresh_token
+
+
+async def noop_app(scope, receive, send):
+    pass
+
+
+def scope_with(profile_token=None, bearer=None):
+    headers = []
+    if profile_token is not None:
+        headers.append((b'x-profile-token', profile_token.encode()))
+    if bearer is not None:
+        headers.append((b'authorization', f'Bearer {bearer}'.encode()))
+    return {'type': 'http', 'headers': headers}
+
+
+@pytest.fixture
+def middleware(monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILING_TOKEN', 'profile-secret')
+    monkeypatch.setattr(profiling, 'PROFILING_ADMINS', {'admin'})
+    monkeypatch.setattr(profiling, 'PROFILING_SAMPLE_RATE', 0.0)
+    return ProfilingMiddleware(noop_app)
+
+
+def test_header_trigger_requires_admin_access_token(middleware):
+    admin = create_access_token({'sub': 'admin', 'user_id': 1})
+    other = create_access_token({'sub': 'ulan', 'user_id': 2})
+
+    assert middleware.trigger(scope_with('profile-secret', admin)) == 'header'
+    assert middleware.trigger(scope_with('profile-secret', other)) is None
+    assert middleware.trigger(scope_with('profile-secret')) is None
+    assert middleware.trigger(scope_with('wrong', admin)) is None
+
+
+def test_header_trigger_rejects_refresh_token(middleware):
+    refresh = create_refresh_token({'sub': 'admin', 'user_id': 1})
+
+    assert middleware.trigger(scope_with('profile-secret', refresh)) is None
+
+
+def test_sampling_works_without_token(monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILING_TOKEN', '')
+    monkeypatch.setattr(profiling, 'PROFILING_SAMPLE_RATE', 1.0)
+    middleware = ProfilingMiddleware(noop_app)
+    admin = create_access_token({'sub': 'admin', 'user_id': 1})
+
+    assert middleware.trigger(scope_with('', admin)) == 'sample'
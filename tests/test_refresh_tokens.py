@@ -0,0 +1,63 @@
+import pytest
+from fastapi import HTTPException
+from delivery_app.refresh_tokens import issue_refresh_token, revoke_refresh_token, rotate_refresh_token
+from delivery_app.security import create_access_token, create_refresh_token, decode_token
+
+
+@pytest.mark.asyncio
+async def test_revoked_refresh_token_cannot_be_rotated(redis):
+    token = await issue_refresh_token(1, 'ulan')
+    await revoke_refresh_token(token)
+
+    with pytest.raises(HTTPException) as exc:
+        await rotate_refresh_token(token)
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_revoked_refresh_token_cannot_be_revoked_twice(redis):
+    token = await issue_refresh_token(1, 'ulan')
+    await revoke_refresh_token(token)
+
+    with pytest.raises(HTTPException) as exc:
+        await revoke_refresh_token(token)
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_revoked_refresh_token_is_not_a_bearer_token(redis):
+    token = await issue_refresh_token(1, 'ulan')
+    await revoke_refresh_token(token)
+
+    with pytest.raises(HTTPException) as exc:
+        decode_token(token)
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_rotation_revokes_the_old_token(redis):
+    token = await issue_refresh_token(1, 'ulan')
+    user_id, username, new_token = await rotate_refresh_token(token)
+
+    assert (user_id, username) == (1, 'ulan')
+    assert new_token != token
+    with pytest.raises(HTTPException):
+        await rotate_refresh_token(token)
+
+
+@pytest.mark.asyncio
+async def test_access_token_cannot_be_rotated(redis):
+    token = create_access_token({'sub': 'ulan', 'user_id': 1})
+    with pytest.raises(HTTPException) as exc:
+        await rotate_refresh_token(token)
+    assert exc.value.status_code == 401
+
+
+def test_revoked_refresh_token_is_refused_by_endpoints(client, redis):
+    token = create_refresh_token({'sub': 'ulan', 'user_id': 1, 'jti': 'revoked'})
+    headers = {'Authorization': f'Bearer {token}'}
+
+    assert client.post('/auth/refresh', params={'refresh_token': token}).status_code == 401
+    assert client.post('/auth/logout', params={'refresh_token': token}).status_code == 401
+    assert client.get('/auth/me', headers=headers).status_code == 401
+    assert client.post('/auth/logout_all', headers=headers).status_code == 401
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from delivery_app.config import SECRET_KEY, ALGORITHM
+from delivery_app.security import create_access_token, create_refresh_token, decode_token, get_current_user
+
+
+def claims_of(token: str):
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+def test_tokens_carry_their_type():
+    assert claims_of(create_access_token({'sub': 'ulan', 'user_id': 1}))['type'] == 'access'
+    assert claims_of(create_refresh_token({'sub': 'ulan', 'user_id': 1}))['type'] == 'refresh'
+
+
+def test_decode_token_rejects_refresh_token_as_access():
+    token = create_refresh_token({'sub': 'ulan', 'user_id': 1})
+
+    with pytest.raises(HTTPException) as exc:
+        decode_token(token)
+    assert exc.value.status_code == 401
+    assert decode_token(token, 'refresh')['user_id'] == 1
+
+
+def test_decode_token_rejects_access_token_as_refresh():
+    token = create_access_token({'sub': 'ulan', 'user_id': 1})
+
+    with pytest.raises(HTTPException):
+        decode_token(token, 'refresh')
+
+
+def test_type_is_checked_for_cached_claims():
+    token = create_refresh_token({'sub': 'ulan', 'user_id': 1})
+    decode_token(token, 'refresh')
+
+    with pytest.raises(HTTPException):
+        decode_token(token)
+
+
+def test_decode_token_rejects_untyped_token():
+    token = jwt.encode({'sub': 'ulan', 'user_id': 1, 'exp': 4102444800}, SECRET_KEY, algorithm=ALGORITHM)
+
+    with pytest.raises(HTTPException):
+        decode_token(token)
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_accepts_access_token(db):
+    db.results.append(SimpleNamespace(id=1, username='ulan', status='client'))
+
+    user = await get_current_user(create_access_token({'sub': 'ulan', 'user_id': 1}), db)
+    assert (user.id, user.username) == (1, 'ulan')
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_rejects_refresh_token(db):
+    db.results.append(SimpleNamespace(id=1, username='ulan', status='client'))
+
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(create_refresh_token({'sub': 'ulan', 'user_id': 1}), db)
+    assert exc.value.status_code == 401
+
+
+def test_me_rejects_refresh_token(client):
+    token = create_refresh_token({'sub': 'ulan', 'user_id': 1})
+
+    response = client.get('/auth/me', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 401